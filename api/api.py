@@ -1,33 +1,71 @@
-import json
+import time
+import threading
 import requests
 import boto3
+import aiohttp
+from requests.adapters import HTTPAdapter
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
-from config import AWS_REGION, AWS_ACCESS_KEY, AWS_SECRET_KEY, AWS_ENDPOINT
+from api.payload_encoding import PayloadEncoder, IDENTITY
+from config import (
+    AWS_REGION, AWS_ACCESS_KEY, AWS_SECRET_KEY, AWS_ENDPOINT,
+    API_CONNECT_TIMEOUT, API_READ_TIMEOUT, API_POOL_CONNECTIONS, API_POOL_MAXSIZE
+)
 
+# Status an endpoint answers with when it can't take the configured upload encoding
+ENCODING_REJECTED_STATUS = 415
 
-class ApiClient:
-    def __init__(self):
+# AWS credentials, resolved once per process and shared by every client
+_credentials = None
+_credentials_lock = threading.Lock()
+
+
+def get_credentials():
+    """Resolve the AWS credentials on first use; boto3 refreshes them if they expire."""
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None:
+            session = boto3.Session(
+                aws_access_key_id=AWS_ACCESS_KEY,
+                aws_secret_access_key=AWS_SECRET_KEY
+            )
+            _credentials = session.get_credentials()
+        return _credentials
+
+
+class _SignedClient:
+    """
+    SigV4 signing, upload encoding and per-path latency stats shared by
+    ApiClient and AsyncApiClient. Pass one PayloadEncoder to several clients
+    to share its byte counts.
+    """
+
+    def __init__(self, encoder: PayloadEncoder = None):
         self.endpoint = AWS_ENDPOINT
         self.region = AWS_REGION
         self.service = "execute-api"
 
         # Create AWS credentials session
-        session = boto3.Session(
-            aws_access_key_id=AWS_ACCESS_KEY,
-            aws_secret_access_key=AWS_SECRET_KEY
-        )
-        self.credentials = session.get_credentials()
+        self.credentials = get_credentials()
+
+        self.encoder = encoder or PayloadEncoder()
+
+        # path -> {"calls", "errors", "total_ms", "max_ms"}
+        self.stats = {}
+        self._stats_lock = threading.Lock()
 
     def sign_request(self, method, path, body=None):
         """Create and sign AWS request"""
         url = f"{self.endpoint}{path}"
 
+        # Body compressed as configured for this endpoint (plain JSON by default)
+        data, extra_headers = self.encoder.encode(path, body)
+
         aws_request = AWSRequest(
             method=method,
             url=url,
-            data=json.dumps(body) if body else None,
-            headers={"Content-Type": "application/json"}
+            data=data,
+            headers={"Content-Type": "application/json", **extra_headers}
         )
         aws_request.prepare()  # Prepare request for signing
 
@@ -36,24 +74,148 @@ class ApiClient:
 
         return aws_request
 
+    def _encoding_rejected(self, path, status) -> bool:
+        """True (and the encoding is dropped for path) if the endpoint refused the encoded body."""
+        if status == ENCODING_REJECTED_STATUS and self.encoder.encoding_for(path) != IDENTITY:
+            self.encoder.disable(path)
+            return True
+        return False
+
+    def _record(self, path, started, ok):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            entry = self.stats.setdefault(path, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            if not ok:
+                entry["errors"] += 1
+
+    def stats_summary(self) -> str:
+        """One line per path: calls, errors, average and worst latency."""
+        with self._stats_lock:
+            lines = []
+            for path, entry in sorted(self.stats.items()):
+                avg_ms = entry["total_ms"] / entry["calls"] if entry["calls"] else 0.0
+                lines.append(
+                    f"{path}: {entry['calls']} calls, {entry['errors']} errors, "
+                    f"avg {avg_ms:.0f} ms, max {entry['max_ms']:.0f} ms"
+                )
+            return "; ".join(lines) or "no calls"
+
+
+class ApiClient(_SignedClient):
+    """
+    SigV4-signed client for the API Gateway endpoints.
+
+    One client is meant to live for the whole run: it keeps a pooled
+    keep-alive requests.Session, so calls after the first reuse the TCP/TLS
+    connection instead of setting up a new one each time. Safe to share
+    between threads. Latency per path is collected in stats.
+
+    Blocking; async code should use AsyncApiClient.
+    """
+
+    def __init__(self, connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT,
+                 pool_connections: int = API_POOL_CONNECTIONS, pool_maxsize: int = API_POOL_MAXSIZE,
+                 encoder: PayloadEncoder = None):
+        super().__init__(encoder)
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def get(self, path):
         """Send GET request"""
+        started = time.perf_counter()
         try:
             request = self.sign_request("GET", path)
-            response = requests.get(request.url, headers=dict(request.headers))
+            response = self.session.get(request.url, headers=dict(request.headers), timeout=self.timeout)
             response.raise_for_status()
+            self._record(path, started, True)
             return response.json()
         except Exception as e:
+            self._record(path, started, False)
             print("GET API Error:", e)
             raise e
 
     def post(self, path, data):
         """Send POST request"""
+        started = time.perf_counter()
         try:
             request = self.sign_request("POST", path, data)
-            response = requests.post(request.url, headers=dict(request.headers), data=request.data)
+            response = self.session.post(request.url, headers=dict(request.headers), data=request.data,
+                                         timeout=self.timeout)
+            if self._encoding_rejected(path, response.status_code):
+                request = self.sign_request("POST", path, data)
+                response = self.session.post(request.url, headers=dict(request.headers), data=request.data,
+                                             timeout=self.timeout)
             response.raise_for_status()
+            self._record(path, started, True)
             return response.json()
         except Exception as e:
+            self._record(path, started, False)
             print("POST API Error:", e)
             raise e
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncApiClient(_SignedClient):
+    """
+    Same endpoints and SigV4 signing as ApiClient on an aiohttp session, so
+    uploads can be awaited without stalling the browser work sharing the
+    event loop. Call start() before use and close() at the end of the run.
+    """
+
+    def __init__(self, connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT,
+                 pool_maxsize: int = API_POOL_MAXSIZE, encoder: PayloadEncoder = None):
+        super().__init__(encoder)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_maxsize = pool_maxsize
+        self.session = None
+
+    async def start(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            )
+
+    async def _send(self, method, path, data=None):
+        await self.start()
+        started = time.perf_counter()
+        try:
+            result = None
+            for attempt in range(2):
+                request = self.sign_request(method, path, data)
+                async with self.session.request(method, request.url, headers=dict(request.headers),
+                                                data=request.data) as response:
+                    if attempt == 0 and self._encoding_rejected(path, response.status):
+                        continue
+                    response.raise_for_status()
+                    result = await response.json(content_type=None)
+                    break
+            self._record(path, started, True)
+            return result
+        except Exception as e:
+            self._record(path, started, False)
+            print(f"{method} API Error:", e)
+            raise e
+
+    async def get(self, path):
+        """Send GET request"""
+        return await self._send("GET", path)
+
+    async def post(self, path, data):
+        """Send POST request"""
+        return await self._send("POST", path, data)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
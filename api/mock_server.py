@@ -0,0 +1,355 @@
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from api.payload_encoding import decode_html_content, ENCODING_FIELD, IDENTITY
+from utils.logger import log
+
+GET_PATH = "/WI_Downloader_Job_SQS_GET"
+ADD_PATH = "/WI_Downloader_Job_To_SQS_ADD"
+INSERT_PATH = "/WI_CounterBasedEntry_INSERT"
+UPDATE_PATH = "/WI_County_DocketNumber_UPDATE"
+STATS_PATH = "/_stats"
+
+URL_FORMAT = "https://wcca.wicourts.gov/caseDetail.html?caseNo={year}{type}{seqNo}&countyNo={countyNo}&index=0&isAdvanced=true&mode=details"
+
+INSERT_FIELDS = {
+    "agencyID": int,
+    "agencyName": str,
+    "datasetID": str,
+    "year": int,
+    "seqNo": int,
+    "htmlContent": str,
+    "docketType": str,
+    "emailID": str
+}
+JOB_FIELDS = {
+    "InitialURL": str,
+    "urlFormat": str,
+    "countyNo": int,
+    "countyName": str,
+    "docketNumber": int,
+    "docketYear": int,
+    "docketType": str
+}
+UPDATE_FIELDS = {
+    "recordId": int,
+    "docketYear": int,
+    "docketNumber": int
+}
+
+
+def _field_errors(payload, fields: dict) -> list:
+    if not isinstance(payload, dict):
+        return [f"expected an object, got {type(payload).__name__}"]
+    errors = []
+    for name, kind in fields.items():
+        value = payload.get(name)
+        if value is None:
+            errors.append(f"{name} is missing")
+        elif not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            errors.append(f"{name} should be {kind.__name__}, got {type(value).__name__}")
+    return errors
+
+
+def parse_job_spec(spec: str) -> dict:
+    """
+    "countyNo:countyName:year:type[:docketNumber[:skipCount]]" -> courtOfficeDetails,
+    e.g. "6:Buffalo County:2025:TR:0:50".
+    """
+    parts = spec.split(":")
+    if len(parts) < 4:
+        raise ValueError(f"job spec needs countyNo:countyName:year:type, got {spec!r}")
+    county_no, county_name, year, docket_type = parts[:4]
+    return {
+        "InitialURL": "https://wcca.wicourts.gov/",
+        "stateName": "WISCONSIN",
+        "stateAbbreviation": "WI",
+        "urlFormat": URL_FORMAT.replace("{type}", docket_type).replace("{countyNo}", county_no),
+        "countyNo": int(county_no),
+        "countyName": county_name,
+        "docketNumber": int(parts[4]) if len(parts) > 4 else 0,
+        "docketYear": int(year),
+        "docketType": docket_type,
+        "consecutiveSkipCount": int(parts[5]) if len(parts) > 5 else 50
+    }
+
+
+class MockState:
+    """
+    In-memory stand-in for the job queue and the tables behind the four
+    endpoints. Jobs are keyed by (countyNo, docketYear, docketType); an ADD
+    puts a job back on the queue with its docket number moved on, as the
+    real SQS queue does, and UPDATE records how far a job got.
+    """
+
+    def __init__(self, jobs: list):
+        self.lock = threading.Lock()
+        self.queue = deque()
+        self.records = {}      # recordId -> courtOfficeDetails
+        self.record_ids = {}   # (countyNo, docketYear, docketType) -> recordId
+        self.inserted = {}     # (agencyID, year, docketType, seqNo) -> HTML bytes
+        self.counts = {GET_PATH: 0, ADD_PATH: 0, INSERT_PATH: 0, UPDATE_PATH: 0}
+        self.rejected = 0
+        self.injected_errors = 0
+        self.duplicates = 0
+        self.started = time.time()
+        for job in jobs:
+            self.enqueue(job)
+
+    def enqueue(self, details: dict) -> int:
+        key = (int(details["countyNo"]), int(details["docketYear"]), details["docketType"])
+        record_id = self.record_ids.get(key)
+        if record_id is not None:
+            # A re-queued job: the scraper sends the filled-in case URL as urlFormat, so
+            # only the position moves on and the stored {year}/{seqNo} template is kept
+            job = self.records[record_id]
+            job["docketYear"] = details["docketYear"]
+            job["docketNumber"] = details["docketNumber"]
+        else:
+            record_id = details.get("recordId") or len(self.records) + 1
+            self.record_ids[key] = record_id
+            job = dict(details, recordId=record_id)
+            job.setdefault("consecutiveSkipCount", 50)
+            self.records[record_id] = job
+        self.queue.append(record_id)
+        return record_id
+
+    def lease(self) -> dict:
+        if not self.queue:
+            return {}
+        return {"courtOfficeDetails": dict(self.records[self.queue.popleft()])}
+
+    def insert(self, item: dict) -> dict:
+        key = (item["agencyID"], item["year"], item["docketType"], item["seqNo"])
+        if key in self.inserted:
+            self.duplicates += 1
+        self.inserted[key] = len(decode_html_content(item).encode("utf-8"))
+        return {"success": True, "seqNo": item["seqNo"]}
+
+    def update(self, payload: dict) -> dict:
+        job = self.records.get(payload["recordId"])
+        if job is None:
+            return None
+        job["docketYear"] = payload["docketYear"]
+        job["docketNumber"] = payload["docketNumber"]
+        return {"success": True, "recordId": payload["recordId"]}
+
+    def snapshot(self) -> dict:
+        elapsed = max(time.time() - self.started, 1e-9)
+        return {
+            "calls": dict(self.counts),
+            "queued_jobs": len(self.queue),
+            "jobs": list(self.records.values()),
+            "inserted_dockets": len(self.inserted),
+            "inserted_html_bytes": sum(self.inserted.values()),
+            "duplicate_inserts": self.duplicates,
+            "rejected_payloads": self.rejected,
+            "injected_errors": self.injected_errors,
+            "inserts_per_second": round(len(self.inserted) / elapsed, 2)
+        }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like API Gateway
+
+    # Set on the class by serve()
+    state = None
+    options = None
+
+    def log_message(self, format, *args):
+        log.debug(f"mock api: {format % args}")
+
+    def _reply(self, status: int, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw) if raw else {}
+
+    def _inject(self) -> bool:
+        """Apply the configured latency, then maybe answer with an injected error."""
+        options = self.options
+        delay = options.latency + random.uniform(0, options.jitter)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        error_paths = options.error_paths or list(self.state.counts)
+        if self.path in error_paths and random.random() < options.error_rate:
+            with self.state.lock:
+                self.state.injected_errors += 1
+            self._reply(options.error_status, {"message": "Injected error"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            with self.state.lock:
+                snapshot = self.state.snapshot()
+            self._reply(200, snapshot)
+            return
+        self._reply(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        if self.path not in self.state.counts:
+            self._reply(404, {"message": "Not Found"})
+            return
+        try:
+            payload = self._read_body()
+        except (ValueError, OSError) as e:
+            self._reply(400, {"message": f"Body is not JSON: {e}"})
+            return
+        with self.state.lock:
+            self.state.counts[self.path] += 1
+        if self._inject():
+            return
+
+        if self.path == GET_PATH:
+            with self.state.lock:
+                job = self.state.lease()
+            self._reply(200, job)
+        elif self.path == ADD_PATH:
+            self._add(payload)
+        elif self.path == UPDATE_PATH:
+            self._update(payload)
+        else:
+            self._insert(payload)
+
+    def _reject(self, errors: list, status: int = 400):
+        with self.state.lock:
+            self.state.rejected += 1
+        log.warning(f"⚠ Mock API rejected {self.path}: {'; '.join(errors)}")
+        self._reply(status, {"message": "Invalid payload", "errors": errors})
+
+    def _add(self, payload: dict):
+        details = payload.get("courtOfficeDetails") if isinstance(payload, dict) else None
+        errors = _field_errors(details, JOB_FIELDS)
+        if errors:
+            self._reject(errors)
+            return
+        with self.state.lock:
+            record_id = self.state.enqueue(details)
+        self._reply(200, {"success": True, "recordId": record_id})
+
+    def _update(self, payload: dict):
+        errors = _field_errors(payload, UPDATE_FIELDS)
+        if errors:
+            self._reject(errors)
+            return
+        with self.state.lock:
+            response = self.state.update(payload)
+        if response is None:
+            self._reject([f"unknown recordId {payload['recordId']}"], 404)
+            return
+        self._reply(200, response)
+
+    def _insert_errors(self, item) -> list:
+        errors = _field_errors(item, INSERT_FIELDS)
+        if errors:
+            return errors
+        if not item["htmlContent"] and not item.get("caseData"):
+            return ["htmlContent and caseData are both empty"]
+        if item.get(ENCODING_FIELD, IDENTITY) != IDENTITY:
+            try:
+                decode_html_content(item)
+            except Exception as e:
+                return [f"htmlContent does not decode as {item[ENCODING_FIELD]}: {e}"]
+        return []
+
+    def _insert(self, payload):
+        if self.options.reject_encoding and self.headers.get("Content-Encoding") == "gzip":
+            self._reject(["Content-Encoding gzip not accepted"], 415)
+            return
+
+        items = payload if isinstance(payload, list) else [payload]
+        if self.options.reject_encoding and any(
+            isinstance(item, dict) and item.get(ENCODING_FIELD, IDENTITY) != IDENTITY for item in items
+        ):
+            self._reject(["compressed htmlContent not accepted"], 415)
+            return
+
+        verdicts = [self._insert_errors(item) for item in items]
+
+        results = []
+        with self.state.lock:
+            for item, errors in zip(items, verdicts):
+                if errors:
+                    self.state.rejected += 1
+                    results.append({"success": False, "error": "; ".join(errors)})
+                else:
+                    results.append(self.state.insert(item))
+
+        if not isinstance(payload, list):
+            if verdicts[0]:
+                log.warning(f"⚠ Mock API rejected {self.path}: {results[0]['error']}")
+                self._reply(400, {"message": "Invalid payload", "errors": verdicts[0]})
+            else:
+                self._reply(200, results[0])
+            return
+        self._reply(200, {"results": results})
+
+
+def serve(options, jobs: list):
+    MockHandler.state = MockState(jobs)
+    MockHandler.options = options
+    server = ThreadingHTTPServer((options.host, options.port), MockHandler)
+    server.daemon_threads = True
+    log.info(f"🧪 Mock API listening on http://{options.host}:{options.port} with {len(jobs)} job(s) queued")
+    log.info(f"   Run the worker with AWS_ENDPOINT=http://{options.host}:{options.port} (any AWS_ACCESS_KEY / AWS_SECRET_KEY)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log.info(f"📊 Mock API stats: {json.dumps(MockHandler.state.snapshot())}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the downloader job/insert API Gateway endpoints"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--job", action="append", default=[],
+                        help="countyNo:countyName:year:type[:docketNumber[:skipCount]]; repeatable")
+    parser.add_argument("--jobs-file", help="JSON list of courtOfficeDetails objects to queue")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls (0-1) answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--error-path", dest="error_paths", action="append", default=[],
+                        help="Only inject errors on this path; repeatable (default: all four endpoints)")
+    parser.add_argument("--reject-encoding", action="store_true",
+                        help="Answer 415 to compressed INSERT payloads, like an endpoint without decoding support")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible latency / errors")
+    options = parser.parse_args(argv)
+
+    if options.seed is not None:
+        random.seed(options.seed)
+
+    jobs = [parse_job_spec(spec) for spec in options.job]
+    if options.jobs_file:
+        with open(options.jobs_file, "r", encoding="utf-8") as f:
+            jobs.extend(json.load(f))
+    if not jobs:
+        jobs = [parse_job_spec("6:Buffalo County:2025:TR:0:50")]
+
+    serve(options, jobs)
+
+
+if __name__ == "__main__":
+    # python -m api.mock_server --job "6:Buffalo County:2025:TR" --latency 50 --error-rate 0.05
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import sys
+import gzip
+import json
+import base64
+import threading
+
+from config import API_PAYLOAD_ENCODINGS, API_COMPRESSION_LEVEL
+from utils.logger import log
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+IDENTITY = "identity"
+GZIP = "gzip"          # htmlContent -> gzip + base64, tagged with htmlContentEncoding
+ZSTD = "zstd"          # htmlContent -> zstd + base64 (needs the zstandard package)
+GZIP_BODY = "gzip-body"  # whole JSON body gzipped, sent with Content-Encoding: gzip
+FIELD_ENCODINGS = (GZIP, ZSTD)
+
+ENCODING_FIELD = "htmlContentEncoding"
+
+
+def parse_encoding_map(spec: str) -> dict:
+    """Parse "path=encoding,path=encoding" (from API_PAYLOAD_ENCODINGS) into a dict."""
+    encodings = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        path, encoding = part.split("=", 1)
+        encodings[path.strip()] = encoding.strip().lower()
+    return encodings
+
+
+def _compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=API_COMPRESSION_LEVEL).compress(raw)
+    return gzip.compress(raw, compresslevel=API_COMPRESSION_LEVEL)
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding.startswith(ZSTD):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def decode_html_content(payload: dict) -> str:
+    """Return a payload's htmlContent as plain HTML, whatever encoding it was sent with."""
+    html = payload.get("htmlContent") or ""
+    encoding = payload.get(ENCODING_FIELD)
+    if not encoding or encoding == IDENTITY:
+        return html
+    return _decompress(base64.b64decode(html), encoding).decode("utf-8")
+
+
+class PayloadEncoder:
+    """
+    Applies the configured upload encoding per endpoint and keeps byte counts.
+
+    Field encodings (gzip, zstd) replace htmlContent with base64 of the
+    compressed HTML and add htmlContentEncoding ("gzip+base64" /
+    "zstd+base64") so the receiver knows how to decode it; payloads are
+    copied, never modified in place. gzip-body compresses the whole JSON
+    body instead and relies on Content-Encoding: gzip.
+
+    An endpoint that rejects the encoding (see disable()) falls back to
+    plain JSON for the rest of the run.
+    """
+
+    def __init__(self, encodings: dict = None):
+        self.encodings = parse_encoding_map(API_PAYLOAD_ENCODINGS) if encodings is None else dict(encodings)
+        for path, encoding in list(self.encodings.items()):
+            if encoding == ZSTD and zstandard is None:
+                log.warning(f"⚠ zstandard is not installed - using gzip for {path}")
+                self.encodings[path] = GZIP
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    def encoding_for(self, path: str) -> str:
+        return self.encodings.get(path, IDENTITY)
+
+    def disable(self, path: str):
+        if self.encodings.pop(path, None):
+            log.warning(f"⚠ {path} rejected the compressed payload - sending it uncompressed from now on")
+
+    def _record(self, raw: int, encoded: int):
+        with self._lock:
+            self.raw_bytes += raw
+            self.encoded_bytes += encoded
+            self.items += 1
+
+    def _encode_item(self, item, encoding: str):
+        if not isinstance(item, dict) or not item.get("htmlContent"):
+            return item
+        raw = item["htmlContent"].encode("utf-8")
+        encoded = base64.b64encode(_compress(raw, encoding)).decode("ascii")
+        self._record(len(raw), len(encoded))
+        item = dict(item)
+        item["htmlContent"] = encoded
+        item[ENCODING_FIELD] = f"{encoding}+base64"
+        return item
+
+    def encode(self, path: str, body):
+        """
+        Serialize a request body for path. Returns (data, extra_headers);
+        data is None for an empty body, as before.
+        """
+        if not body:
+            return None, {}
+
+        encoding = self.encoding_for(path)
+        if encoding in FIELD_ENCODINGS:
+            if isinstance(body, list):
+                body = [self._encode_item(item, encoding) for item in body]
+            else:
+                body = self._encode_item(body, encoding)
+
+        data = json.dumps(body)
+        if encoding == GZIP_BODY:
+            raw = data.encode("utf-8")
+            compressed = _compress(raw, GZIP)
+            self._record(len(raw), len(compressed))
+            return compressed, {"Content-Encoding": "gzip"}
+        return data, {}
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.items:
+                return "no compressed uploads"
+            ratio = self.raw_bytes / self.encoded_bytes if self.encoded_bytes else 0.0
+            return (
+                f"{self.items} payloads, {self.raw_bytes / (1024 * 1024):.1f} MB -> "
+                f"{self.encoded_bytes / (1024 * 1024):.1f} MB ({ratio:.1f}x smaller)"
+            )
+
+
+if __name__ == "__main__":
+    # Decode a saved INSERT payload (object or array) back to plain HTML:
+    #   python -m api.payload_encoding payload.json > case.html
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    for entry in saved if isinstance(saved, list) else [saved]:
+        print(decode_html_content(entry))
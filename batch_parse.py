@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, List
+
+from config import HTML_PARSER
+from scrapers.html_to_json import parse_html_to_json
+from utils.logger import log
+
+PROGRESS_INTERVAL = 10  # seconds between progress lines
+DEFAULT_CHUNKSIZE = 32  # files handed to a worker process at a time
+TAIL_CHUNK = 64 * 1024  # bytes read at a time when looking for the last complete line
+ENTRY_PREFIX = '{"file": '  # every output line starts with its file, then its job
+
+_decoder = json.JSONDecoder()
+
+_backend = HTML_PARSER  # set in each worker by _init_worker
+
+
+def job_config_from_path(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild the job config html_to_json needs from a saved page's name,
+    {state}_{countyNo}_{docketYear}_{docketType}_{docketNumber}.html.
+    Year and type are told apart by their shape rather than position, since
+    files saved by the old main swapped them ({state}_{countyNo}_{docketType}_{docketYear}_...).
+    When the type is missing from the name, the case type directory of the
+    data/<date>/<state>/<county>/<case_type>/htmldata layout is used.
+    Returns None for names that don't fit.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parts = stem.split("_")
+    if len(parts) < 3 or not parts[-1].isdigit():
+        return None
+
+    state, county_no, docket_number = parts[0], parts[1], parts[-1]
+    docket_year = next((p for p in parts[2:-1] if len(p) == 4 and p.isdigit()), None)
+    docket_type = next((p for p in parts[2:-1] if p.isalpha()), None)
+    if docket_type is None:
+        html_dir = os.path.dirname(os.path.abspath(path))
+        if os.path.basename(html_dir) == "htmldata":
+            docket_type = os.path.basename(os.path.dirname(html_dir)) or None
+
+    return {
+        "stateAbbreviation": state,
+        "countyNo": int(county_no) if county_no.isdigit() else county_no,
+        "docketYear": int(docket_year) if docket_year else None,
+        "docketType": docket_type,
+        "docketNumber": docket_number
+    }
+
+
+def find_html_files(inputs: List[str]) -> List[str]:
+    """Every .html file under the given files/directories, sorted so runs shard the same way."""
+    paths = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, _, files in os.walk(entry):
+                paths.extend(os.path.join(root, name) for name in files if name.endswith(".html"))
+        elif entry.endswith(".html"):
+            paths.append(entry)
+    return sorted(set(paths))
+
+
+def truncate_partial_line(f):
+    """Cut a half-written last line (the run was killed mid-write) off a file opened rb+."""
+    end = f.seek(0, os.SEEK_END)
+    pos = end
+    while pos > 0:
+        size = min(TAIL_CHUNK, pos)
+        pos -= size
+        f.seek(pos)
+        chunk = f.read(size)
+        if pos + size == end and chunk.endswith(b"\n"):
+            return
+        newline = chunk.rfind(b"\n")
+        if newline != -1:
+            f.truncate(pos + newline + 1)
+            return
+    f.truncate(0)
+
+
+def entry_status(line: str) -> Optional[tuple]:
+    """
+    (file, failed) of one output line, read from its leading "file" and
+    "job" keys so the (large) parse result is never decoded. Lines written
+    some other way fall back to json.loads; None if the line is unreadable.
+    """
+    try:
+        if line.startswith(ENTRY_PREFIX):
+            path, end = _decoder.raw_decode(line, len(ENTRY_PREFIX))
+            if line.startswith(', "job": ', end):
+                _, end = _decoder.raw_decode(line, end + len(', "job": '))
+                if line.startswith(', "result": ', end):
+                    return path, False
+                if line.startswith(', "error": ', end):
+                    return path, True
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    return entry.get("file"), "error" in entry
+
+
+def load_done(output_path: str, retry_errors: bool) -> set:
+    """
+    Files already in the output JSONL, so an interrupted run picks up where
+    it stopped. The file is read a line at a time; a half-written last line
+    is cut off so new lines don't get appended onto it. With retry_errors
+    the failed entries are dropped from the file and parsed again.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "rb+") as f:
+        truncate_partial_line(f)
+
+    tmp_path = None
+    out = None
+    dropped = 0
+    if retry_errors:
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".parsed-", suffix=".tmp", dir=directory)
+        out = os.fdopen(fd, "w", encoding="utf-8", newline="")
+
+    try:
+        with open(output_path, "r", encoding="utf-8", newline="") as f:
+            for line in f:
+                status = entry_status(line)
+                if status is None or (retry_errors and status[1]):
+                    dropped += 1
+                    continue
+                done.add(status[0])
+                if out is not None:
+                    out.write(line)
+
+        if out is not None:
+            out.flush()
+            os.fsync(out.fileno())
+            out.close()
+            if dropped:
+                os.replace(tmp_path, output_path)
+    except Exception:
+        if out is not None:
+            out.close()
+        raise
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return done
+
+
+def _init_worker(backend: str):
+    global _backend
+    _backend = backend
+
+
+def parse_one(path: str) -> tuple:
+    """Parse one saved page in a worker; returns (ok, JSONL line)."""
+    job_config = job_config_from_path(path)
+    entry = {"file": path, "job": job_config}
+    try:
+        if job_config is None:
+            raise ValueError("file name does not match {state}_{countyNo}_{year}_{type}_{docketNumber}.html")
+        with open(path, "rb") as f:
+            entry["result"] = parse_html_to_json(f.read(), job_config, _backend)
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return "error" not in entry, json.dumps(entry, ensure_ascii=False)
+
+
+def run_batch(inputs: List[str], output_path: str, workers: int = None, chunksize: int = DEFAULT_CHUNKSIZE,
+              backend: str = HTML_PARSER, retry_errors: bool = False) -> Dict[str, Any]:
+    """
+    Parse every saved page under inputs across a process pool and append
+    one JSON line per file to output_path ({"file", "job", "result"} or
+    {"file", "job", "error"}). Files already in the output are skipped.
+    """
+    workers = workers or os.cpu_count() or 1
+    paths = find_html_files(inputs)
+    done = load_done(output_path, retry_errors)
+    todo = [path for path in paths if path not in done]
+    log.info(f"📂 {len(paths)} HTML files found, {len(paths) - len(todo)} already parsed, {len(todo)} to go")
+    log.info(f"⚙ {workers} worker processes, {chunksize} files per chunk, parser backend {backend}")
+
+    stats = {"files": len(todo), "parsed": 0, "errors": 0, "seconds": 0.0}
+    if not todo:
+        return stats
+
+    started = time.perf_counter()
+    last_report = started
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(backend,)) as pool:
+        for count, (ok, line) in enumerate(pool.map(parse_one, todo, chunksize=chunksize), 1):
+            out.write(line + "\n")
+            stats["parsed" if ok else "errors"] += 1
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL or count == len(todo):
+                out.flush()
+                last_report = now
+                rate = count / (now - started)
+                eta = (len(todo) - count) / rate if rate else 0
+                log.info(
+                    f"📈 {count}/{len(todo)} files ({count / len(todo):.1%}), {rate:.1f} files/s, "
+                    f"{stats['errors']} errors, ETA {eta / 60:.1f} min"
+                )
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+if __name__ == "__main__":
+    # python batch_parse.py data/ -o parsed.jsonl
+    # (re-run the same command after an interruption to continue)
+    parser = argparse.ArgumentParser(description="Parse saved WCCA case pages to JSON Lines on all cores")
+    parser.add_argument("inputs", nargs="+", help="HTML files or directories (searched recursively)")
+    parser.add_argument("-o", "--output", default="parsed_cases.jsonl")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--backend", default=HTML_PARSER, help="auto, lxml or html.parser")
+    parser.add_argument("--retry-errors", action="store_true", help="Parse files that failed last time again")
+    args = parser.parse_args()
+
+    stats = run_batch(args.inputs, args.output, args.workers, args.chunksize, args.backend, args.retry_errors)
+    if stats["seconds"]:
+        log.info(
+            f"✅ Parsed {stats['parsed']} files ({stats['errors']} errors) in {stats['seconds']:.1f}s "
+            f"- {stats['files'] / stats['seconds']:.1f} files/s -> {args.output}"
+        )
+    sys.exit(1 if stats["errors"] else 0)
@@ -7,6 +7,109 @@ AWS_REGION = os.getenv("AWS_REGION")
 AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
 AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
 AWS_ENDPOINT = os.getenv("AWS_ENDPOINT")
+
+# API Gateway client: timeouts in seconds, keep-alive connection pool
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "10"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "60"))
+API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))  # Hosts kept in the pool
+API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "10"))         # Open connections kept per host
+
+# Upload encoding per endpoint, e.g. "/WI_CounterBasedEntry_INSERT=gzip"
+# (gzip / zstd compress htmlContent + base64; gzip-body gzips the whole body). Unlisted paths send plain JSON.
+API_PAYLOAD_ENCODINGS = os.getenv("API_PAYLOAD_ENCODINGS", "")
+API_COMPRESSION_LEVEL = int(os.getenv("API_COMPRESSION_LEVEL", "6"))
+
+# Browser runtime
+BROWSER_PROFILE_DIR = os.getenv("BROWSER_PROFILE_DIR", "ny_chrome_profile")
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "false").lower() == "true"
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))          # Pages kept open in the pooled context
+BROWSER_PAGE_MAX_USES = int(os.getenv("BROWSER_PAGE_MAX_USES", "50"))  # Dockets served before a page is recycled
+
+# Browser sessions: each has its own profile dir and cookie jar and its own captcha budget
+BROWSER_SESSIONS = max(1, int(os.getenv("BROWSER_SESSIONS", "1")))
+SESSION_CAPTCHA_BUDGET = int(os.getenv("SESSION_CAPTCHA_BUDGET", "100"))      # Requests a session usually gets before a captcha
+SESSION_BUDGET_MARGIN = int(os.getenv("SESSION_BUDGET_MARGIN", "10"))         # Shift work away this many requests before the budget
+SESSION_CAPTCHA_COOLDOWN = float(os.getenv("SESSION_CAPTCHA_COOLDOWN", "900"))  # Seconds a session rests after an unsolved captcha
+
+# Cookie store: seconds between write-behind flushes of wcca_cookies.json
+COOKIE_FLUSH_INTERVAL = float(os.getenv("COOKIE_FLUSH_INTERVAL", "30"))
+
+# Request interception on case detail pages (comma separated env overrides)
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "true").lower() == "true"
+RESOURCE_ALLOWED_TYPES = os.getenv("RESOURCE_ALLOWED_TYPES", "document,script,xhr,fetch").split(",")
+RESOURCE_ALLOWED_URL_PATTERNS = os.getenv("RESOURCE_ALLOWED_URL_PATTERNS", r"^https?://wcca\.wicourts\.gov/").split(",")
+RESOURCE_CAPTCHA_URL_PATTERNS = os.getenv(
+    "RESOURCE_CAPTCHA_URL_PATTERNS",
+    r"hcaptcha\.com,geetest\.com,geevisit\.com,google\.com/recaptcha,gstatic\.com/recaptcha"
+).split(",")
+
+# Direct HTTP fetch path (browser is only used on captcha / JS-only pages)
+FETCH_ENGINE = os.getenv("FETCH_ENGINE", "browser").lower()  # "browser" or "http"
+HTTP_FETCH_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", "30"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+HTTP_MAX_JS_ESCALATIONS = int(os.getenv("HTTP_MAX_JS_ESCALATIONS", "10"))  # JS-only pages in a row before HTTP fetch is disabled
+WCCA_CASE_DATA_URL = os.getenv("WCCA_CASE_DATA_URL", "")  # Optional data call template, e.g. ...?caseNo={caseNo}&countyNo={countyNo}
+
+# What gets uploaded per docket: "html" (rendered DOM), "payload" (captured case JSON,
+# falls back to HTML when none was captured) or "both"
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "html").lower()
+CASE_PAYLOAD_URL_PATTERNS = os.getenv("CASE_PAYLOAD_URL_PATTERNS", r"^https?://wcca\.wicourts\.gov/").split(",")
+
+# Case page parsing (scrapers/html_to_json.py): "auto" (lxml when installed), "lxml" or "html.parser"
+HTML_PARSER = os.getenv("HTML_PARSER", "auto").lower()
+HTML_CONTENT_ONLY = os.getenv("HTML_CONTENT_ONLY", "true").lower() == "true"  # Build only div.content-column into a tree
+NORMALIZER_CACHE_SIZE = int(os.getenv("NORMALIZER_CACHE_SIZE", "8192"))  # Dates / amounts / addresses remembered per process
+
+# Scraping
+SCRAPE_CONCURRENCY = max(1, int(os.getenv("SCRAPE_CONCURRENCY", "1")))  # Consecutive dockets loaded in parallel per job
+
+# Worker: SQS jobs scraped at once, and the request rate allowed per host across all of them
+WORKER_JOB_CONCURRENCY = max(1, int(os.getenv("WORKER_JOB_CONCURRENCY", "1")))
+PREFETCH_MAX_WAIT = float(os.getenv("PREFETCH_MAX_WAIT", "300"))  # Seconds a job leased ahead of time waits for a slot before it is re-queued
+HOST_RATE_LIMIT = float(os.getenv("HOST_RATE_LIMIT", "1.0"))  # Case page requests per second per host; 0 disables
+HOST_RATE_BURST = int(os.getenv("HOST_RATE_BURST", "3"))      # Requests allowed back to back before the limit applies
+
+# Adaptive rate control (AIMD) of the WCCA request rate, starting from HOST_RATE_LIMIT
+RATE_CONTROL = os.getenv("RATE_CONTROL", "true").lower() == "true"
+RATE_MIN = float(os.getenv("RATE_MIN", "0.2"))                    # Requests per second never gone below
+RATE_MAX = float(os.getenv("RATE_MAX", "5.0"))                    # Requests per second never gone above
+RATE_INCREASE = float(os.getenv("RATE_INCREASE", "0.05"))         # Added per clean response
+RATE_DECREASE = float(os.getenv("RATE_DECREASE", "0.5"))          # Multiplier on captcha / timeout / latency spike
+RATE_LATENCY_SPIKE = float(os.getenv("RATE_LATENCY_SPIKE", "3.0"))  # Response this many times the average counts as a spike
+RATE_BACKOFF_COOLDOWN = float(os.getenv("RATE_BACKOFF_COOLDOWN", "10"))  # Seconds between two back-offs
+RATE_STATUS_FILE = os.getenv("RATE_STATUS_FILE", "rate_status.json")    # Current rate for monitoring; empty disables
+
+# INSERT batching: dockets per call (1 = one call per docket, as before), and when a partial batch is sent anyway
+INSERT_BATCH_PATH = os.getenv("INSERT_BATCH_PATH", "/WI_CounterBasedEntry_INSERT")
+INSERT_BATCH_SIZE = max(1, int(os.getenv("INSERT_BATCH_SIZE", "1")))
+INSERT_BATCH_MAX_BYTES = int(os.getenv("INSERT_BATCH_MAX_BYTES", str(5 * 1024 * 1024)))  # API Gateway caps requests at 10 MB
+INSERT_BATCH_MAX_WAIT = float(os.getenv("INSERT_BATCH_MAX_WAIT", "10"))  # Seconds the first docket of a batch may wait
+
+# Background upload stage: dockets buffered between scraping and INSERT, and uploader tasks per job
+UPLOAD_QUEUE_SIZE = int(os.getenv("UPLOAD_QUEUE_SIZE", "20"))     # Scraping pauses while this many dockets await upload
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "2"))
+UPLOAD_RETRIES = int(os.getenv("UPLOAD_RETRIES", "3"))            # Retries of a failed INSERT before the job stops
+UPLOAD_RETRY_DELAY = float(os.getenv("UPLOAD_RETRY_DELAY", "2"))  # Seconds before the first retry, doubled each time
+
+# Upload outbox (SQLite): scraped dockets kept on disk until the INSERT is confirmed, replayed on startup
+OUTBOX_FILE = os.getenv("OUTBOX_FILE", "upload_outbox.sqlite3")  # Empty disables the outbox
+OUTBOX_MAX_BYTES = int(os.getenv("OUTBOX_MAX_BYTES", str(512 * 1024 * 1024)))  # Compressed payload bytes kept at most
+OUTBOX_SYNC = os.getenv("OUTBOX_SYNC", "normal").lower()  # PRAGMA synchronous: off, normal or full
+
+# Known-unavailable docket cache (SQLite); TTL 0 disables it
+UNAVAILABLE_CACHE_FILE = os.getenv("UNAVAILABLE_CACHE_FILE", "unavailable_dockets.sqlite3")
+UNAVAILABLE_CACHE_TTL = float(os.getenv("UNAVAILABLE_CACHE_TTL", str(6 * 3600)))  # Seconds an unavailable result is trusted
+UNAVAILABLE_CACHE_MAX_ENTRIES = int(os.getenv("UNAVAILABLE_CACHE_MAX_ENTRIES", "200000"))
+
+# Frontier discovery: find the last existing docket by galloping/bisection before the linear pass
+FRONTIER_MODE = os.getenv("FRONTIER_MODE", "false").lower() == "true"
+FRONTIER_MAX_STEP = int(os.getenv("FRONTIER_MAX_STEP", "256"))        # Largest gallop stride
+FRONTIER_CONFIRM_PROBES = int(os.getenv("FRONTIER_CONFIRM_PROBES", "2"))  # Dockets right after a miss checked before it counts, then wider strides up to the skip count
+FRONTIER_TAIL_SKIP = int(os.getenv("FRONTIER_TAIL_SKIP", "5"))        # Missing dockets in a row past the frontier before the job stops
+
 DATASET_ID_MAP = {
     "TR": "901",  # Traffic Forfeiture
     "CT": "902",  # Criminal Traffic
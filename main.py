@@ -3,11 +3,22 @@ import os
 import json
 from datetime import datetime
 from scrapers.wisconsin_scraper import WisconsinScraper
+from utils.session_pool import SessionPool, session_cookie_file
+from utils.frontier import find_docket_frontier, FrontierProbeError
+from utils.unavailable_cache import UnavailableDocketCache
+from utils.rate_limiter import HostRateLimiter
+from utils.rate_controller import AimdRateController
+from utils.upload_queue import UploadQueue
+from utils.upload_outbox import UploadOutbox
 from utils.logger import log
 from vpn.vpnbot import SurfsharkManager
 import time
-from api.api import ApiClient
-from config import DATASET_ID_MAP
+from api.api import ApiClient, AsyncApiClient
+from api.payload_encoding import PayloadEncoder
+from config import (
+    DATASET_ID_MAP, BROWSER_POOL_SIZE, BROWSER_SESSIONS, SCRAPE_CONCURRENCY, CAPTURE_MODE,
+    FRONTIER_MODE, FRONTIER_TAIL_SKIP, WORKER_JOB_CONCURRENCY, PREFETCH_MAX_WAIT, INSERT_BATCH_SIZE
+)
 import signal
 import sys
 
@@ -71,17 +82,9 @@ def build_dataset_id(state_code: str, case_type: str) -> str:
 # GLOBAL STATE FOR GRACEFUL SHUTDOWN
 # ----------------------------------------
 shutdown_requested = False
-current_job_state = {
-    "api_client": None,
-    "record_id": None,
-    "initial_url": None,
-    "url_format": None,
-    "county_no": None,
-    "county_name": None,
-    "docket_year": None,
-    "docket_type": None,
-    "last_successful_docket": None
-}
+# State of every job this worker is running, keyed by recordId, so the signal
+# handler can re-queue each one from its last successful docket
+active_job_states = {}
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
@@ -91,29 +94,31 @@ def signal_handler(sig, frame):
     log.info("="*60)
     shutdown_requested = True
     
-    # Call ADD API with last successful docket
-    if current_job_state["last_successful_docket"] and current_job_state["api_client"]:
-        log.info("📤 Calling ADD API to re-queue job from last successful docket...")
+    # Call ADD API with last successful docket of every running job
+    for job_state in list(active_job_states.values()):
+        if not (job_state["last_successful_docket"] and job_state["api_client"]):
+            continue
+        log.info(f"📤 Calling ADD API to re-queue {job_state['county_name']} {job_state['docket_year']}{job_state['docket_type']} from last successful docket...")
         try:
             # Format the URL with actual values
-            formatted_docket = str(current_job_state["last_successful_docket"]).zfill(6)
-            formatted_url = f"https://wcca.wicourts.gov/caseDetail.html?caseNo={current_job_state['docket_year']}{current_job_state['docket_type']}{formatted_docket}&countyNo={current_job_state['county_no']}&index=0&isAdvanced=true&mode=details"
+            formatted_docket = str(job_state["last_successful_docket"]).zfill(6)
+            formatted_url = f"https://wcca.wicourts.gov/caseDetail.html?caseNo={job_state['docket_year']}{job_state['docket_type']}{formatted_docket}&countyNo={job_state['county_no']}&index=0&isAdvanced=true&mode=details"
 
             add_payload = {
                 "courtOfficeDetails": {
-                    "InitialURL": current_job_state["initial_url"],
+                    "InitialURL": job_state["initial_url"],
                     "stateName": "WISCONSIN",
                     "stateAbbreviation": "WI",
                     "urlFormat": formatted_url,
-                    "countyNo": int(current_job_state["county_no"]),
-                    "countyName": current_job_state["county_name"],
-                    "docketNumber": int(current_job_state["last_successful_docket"]),
-                    "docketYear": int(current_job_state["docket_year"]),
-                    "docketType": current_job_state["docket_type"]
+                    "countyNo": int(job_state["county_no"]),
+                    "countyName": job_state["county_name"],
+                    "docketNumber": int(job_state["last_successful_docket"]),
+                    "docketYear": int(job_state["docket_year"]),
+                    "docketType": job_state["docket_type"]
                 }
             }
             # log.info(f"  ADD API Payload: {add_payload}")
-            add_response = current_job_state["api_client"].post("/WI_Downloader_Job_To_SQS_ADD", add_payload)
+            add_response = job_state["api_client"].post("/WI_Downloader_Job_To_SQS_ADD", add_payload)
             log.info(f"✅ ADD API called successfully: {add_response}")
         except Exception as e:
             log.error(f"❌ Failed to call ADD API during shutdown: {e}")
@@ -144,6 +149,8 @@ signal.signal(signal.SIGTERM, signal_handler)
 #     "docketUpdateDateTime": "2025-11-11T10:10:00Z"
 # }
 
+WCCA_HOST = "wcca.wicourts.gov"
+
 UNAVAILABLE_TITLE = "Your request could not be processed."
 UNAVAILABLE_SNIPPET_1 = "Your request could not be processed."
 UNAVAILABLE_SNIPPET_2 = "That case does not exist or you are not allowed to see it."
@@ -180,109 +187,429 @@ def html_indicates_unavailable(html: str) -> bool:
     return (UNAVAILABLE_SNIPPET_1.lower() in lower) and (UNAVAILABLE_SNIPPET_2.lower() in lower)
 
 async def initialize_cookies_if_needed():
-    """Check if cookies exist, if not run the cookie saver"""
-    cookie_file = "wcca_cookies.json"
-    
-    if not os.path.exists(cookie_file):
-        log.info("="*60)
-        log.info("🍪 No cookies found - Running cookie initialization...")
-        log.info("="*60)
+    """Check if every session has cookies, if not run the cookie saver for it"""
+    for index in range(BROWSER_SESSIONS):
+        cookie_file = session_cookie_file(index)
         
-        # Import and run save_cookies
-        from save_cookies import save_wcca_cookies
-        await save_wcca_cookies()
-        
-        log.info("✅ Cookies saved successfully")
-        log.info("="*60 + "\n")
-    else:
-        log.info("✅ Existing cookies found - skipping initialization\n")
+        if not os.path.exists(cookie_file):
+            log.info("="*60)
+            log.info(f"🍪 No cookies found in {cookie_file} - Running cookie initialization...")
+            log.info("="*60)
+            
+            # Import and run save_cookies
+            from save_cookies import save_wcca_cookies
+            await save_wcca_cookies(cookie_file)
+            
+            log.info("✅ Cookies saved successfully")
+            log.info("="*60 + "\n")
+        else:
+            log.info(f"✅ Existing cookies found in {cookie_file} - skipping initialization\n")
+
+async def scrape_on_session(session_pool: SessionPool, docket_config: dict, rate_limiter=None, rate_controller=None):
+    """
+    Scrape one docket on the session the pool picks, account for it on that
+    session and feed the outcome to the adaptive rate controller.
+    """
+    session = session_pool.pick()
+    if session is None:
+        docket = f"{docket_config['docketYear']}{docket_config['docketType']}{docket_config['docketNumber']}"
+        return {"docket": docket, "html": "", "status": "failed"}
+
+    results = None
+    try:
+        scraper = WisconsinScraper(
+            config=docket_config,
+            browser_pool=session.browser_pool,
+            http_fetcher=session.http_fetcher,
+            cookie_store=session.cookie_store,
+            rate_limiter=rate_limiter
+        )
+        results = await scraper.run_scraper()
+        if rate_controller is not None:
+            rate_controller.record(results)
+        return results
+    finally:
+        session_pool.record(session, results)
+
+async def replay_result(results: dict):
+    """Stand-in scrape task for a docket whose result is already known."""
+    return results
 
 # ----------------------------------------
 # MAIN LOOP
 # ----------------------------------------
 async def main():
-    global shutdown_requested, current_job_state
-    
     # Initialize cookies on the first run
     await initialize_cookies_if_needed()
 
     # Initialize VPN once at startup
     initialize_vpn()
-    
-    while not shutdown_requested:
-        api_client = ApiClient()
-        current_job_state["api_client"] = api_client
 
-        # ----------------------------------------
-        # STEP 1: GET JOB FROM QUEUE
-        # ----------------------------------------
-        try:
-            api_response = api_client.post("/WI_Downloader_Job_SQS_GET", {})
-            log.info(f"✅ GET API call successful. Response: {api_response}")
-            print()
+    # Independent browser sessions (profile + in-memory cookie jar each) for the whole run;
+    # scrapers borrow pages from whichever session has the most captcha budget left
+    session_pool = SessionPool(max_pages=max(BROWSER_POOL_SIZE, SCRAPE_CONCURRENCY * WORKER_JOB_CONCURRENCY))
+    await session_pool.start()
+
+    # Dockets recently confirmed unavailable, so re-queued jobs don't probe them again
+    unavailable_cache = UnavailableDocketCache()
+
+    # Shared per-host request budget, adapted to how WCCA responds
+    rate_limiter = HostRateLimiter()
+    rate_controller = AimdRateController(rate_limiter.bucket(WCCA_HOST))
+
+    # Signed API clients with keep-alive connection pools for the whole run: the async
+    # one for calls made from the event loop, the blocking one for the shutdown handler
+    payload_encoder = PayloadEncoder()
+    api_client = ApiClient(encoder=payload_encoder)
+    async_api_client = AsyncApiClient(encoder=payload_encoder)
+    await async_api_client.start()
+
+    # Dockets scraped but not yet confirmed by the API, on disk; send what a previous run left behind first
+    upload_outbox = UploadOutbox()
+    await upload_outbox.replay(async_api_client, batch_size=INSERT_BATCH_SIZE)
+
+    # Long-lived resources shared by every job of the run
+    runtime = {
+        "api_client": api_client,
+        "async_api_client": async_api_client,
+        "session_pool": session_pool,
+        "unavailable_cache": unavailable_cache,
+        "rate_limiter": rate_limiter,
+        "rate_controller": rate_controller,
+        "upload_outbox": upload_outbox
+    }
+
+    try:
+        await process_jobs(runtime)
+    finally:
+        log.info(f"🧑‍🤝‍🧑 Sessions: {session_pool.status()}")
+        log.info(f"🗂 Unavailable-docket cache hits this run: {unavailable_cache.hits}")
+        log.info(f"🚦 Rate controller: {rate_controller.snapshot()}")
+        rate_controller.write_status()
+        log.info(f"📡 API latency: {async_api_client.stats_summary()}")
+        log.info(f"🗜 Upload compression: {payload_encoder.summary()}")
+        log.info(f"📮 Upload outbox: {upload_outbox.pending()} docket(s) pending, {upload_outbox.replayed} replayed, {upload_outbox.skipped} not persisted")
+        await async_api_client.close()
+        api_client.close()
+        await session_pool.close()
+        unavailable_cache.close()
+        upload_outbox.close()
+
+async def lease_job(api_client: AsyncApiClient):
+    """
+    Take the next job from the queue. Returns its courtOfficeDetails, None
+    when the queue is empty, or raises if the GET call failed.
+    """
+    api_response = await api_client.post("/WI_Downloader_Job_SQS_GET", {})
+    log.info(f"✅ GET API call successful. Response: {api_response}")
+    print()
+    return api_response.get("courtOfficeDetails")
+
+async def drain_finalizers(runtime: dict):
+    """Wait for every UPDATE/ADD call still in flight."""
+    if runtime["finalizers"]:
+        await asyncio.gather(*list(runtime["finalizers"]), return_exceptions=True)
+
+async def process_jobs(runtime: dict):
+    """
+    Worker loop: keep up to WORKER_JOB_CONCURRENCY jobs running side by side,
+    leasing a new one whenever a slot frees up. Jobs share the browser
+    sessions and the per-host rate limit, but each keeps its own skip
+    counter and its own UPDATE/ADD finalization.
+
+    When a running job is winding down (half of its active miss limit used
+    up) the next job is leased and prepared in the background, so it starts
+    the moment the slot frees up; the finished job's UPDATE/ADD is sent
+    meanwhile. A job leased ahead of time that still has no slot after
+    PREFETCH_MAX_WAIT seconds (the running job found dockets again) is
+    re-queued, before its lease can run out and it gets handed out twice.
+
+    The VPN is only reconnected once every running job has finished. An
+    unsolved captcha stops the leasing of new jobs: the other running jobs
+    are left to finish (one that hits a captcha too re-queues itself with
+    ADD), a job leased ahead of time that never started is re-queued, and
+    then the worker exits.
+    """
+    running = set()
+    next_job = None  # lease of the next job, started ahead of time
+    prefetched_at = None  # when that lease was started early, while no slot was free
+    wake = None      # resolves when a running job asks for that lease
+    queue_empty = False
+    stop_reason = None  # "captcha" or "api" once no further jobs should be leased
+    vpn_reconnect_pending = False
+    runtime["prefetch_wanted"] = asyncio.Event()
+    runtime["finalizers"] = set()
+
+    def can_lease() -> bool:
+        # No lease may be in flight across the blocking VPN reconnect
+        return not queue_empty and stop_reason is None and not shutdown_requested and not vpn_reconnect_pending
+
+    try:
+        while not shutdown_requested:
+            # ----------------------------------------
+            # STEP 1: GET JOBS FROM QUEUE
+            # ----------------------------------------
+            while len(running) < WORKER_JOB_CONCURRENCY and can_lease():
+                prefetched_at = None
+                if next_job is None:
+                    log.info("🔄 Fetching next job from queue...")
+                    next_job = asyncio.create_task(lease_next_job(runtime))
+                try:
+                    job = await next_job
+                except Exception as e:
+                    log.error(f"❌ GET API call failed: {e}")
+                    print("API call failed:", e)
+                    stop_reason = "api"
+                    break
+                finally:
+                    next_job = None
 
-            court_details = api_response.get("courtOfficeDetails")
-            if not court_details:
-                log.error("🛑 No more jobs in queue - Stopping loop")
+                if job is None:
+                    log.error("🛑 No more jobs in queue - Stopping loop")
+                    queue_empty = True
+                    break
+
+                running.add(asyncio.create_task(run_job(job, runtime)))
+
+            if not running:
+                if vpn_reconnect_pending:
+                    # A lease started before the reconnect became pending completes first;
+                    # the job it got starts once the VPN is back
+                    if next_job is not None:
+                        await asyncio.wait({next_job})
+                    await drain_finalizers(runtime)
+                    reconnect_vpn_if_needed()
+                    vpn_reconnect_pending = False
+                    continue
                 break
 
-            # Extract job details
-            record_id = court_details.get("recordId")
-            initial_url = court_details.get("InitialURL")
-            url_format = court_details.get("urlFormat")
-            consecutive_skip_count = court_details.get("consecutiveSkipCount", 50)
-            county_no = court_details.get("countyNo")
-            county_name = court_details.get("countyName")
-            docket_year = court_details.get("docketYear")
-            docket_number = court_details.get("docketNumber")
-            docket_type = court_details.get("docketType")
-
-            # Update global state
-            current_job_state.update({
-                "record_id": record_id,
-                "initial_url": initial_url,
-                "url_format": url_format,
-                "county_no": county_no,
-                "county_name": county_name,
-                "docket_year": docket_year,
-                "docket_type": docket_type,
-                "last_successful_docket": str(docket_number).zfill(6)
-            })
-
-            log.info(f"📋 Job Details: County={county_name}, Year={docket_year}, Type={docket_type}, StartDocket={docket_number}, SkipCount={consecutive_skip_count}")
+            # A job close to its skip limit asks for the next lease early
+            if runtime["prefetch_wanted"].is_set():
+                runtime["prefetch_wanted"].clear()
+                if next_job is None and can_lease():
+                    log.info("⏩ Leasing the next job ahead of time")
+                    next_job = asyncio.create_task(lease_next_job(runtime))
+                    prefetched_at = time.time()
+
+            if wake is None:
+                wake = asyncio.create_task(runtime["prefetch_wanted"].wait())
+            # An early lease is only waited for until PREFETCH_MAX_WAIT has passed
+            waitables = running | {wake}
+            timeout = None
+            if prefetched_at is not None:
+                timeout = prefetched_at + PREFETCH_MAX_WAIT - time.time()
+                if timeout <= 0:
+                    waitables.add(next_job)
+                    timeout = None
+            done, _ = await asyncio.wait(waitables, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if wake in done:
+                wake = None
+
+            for task in done:
+                if task not in running:
+                    continue
+                running.discard(task)
+                try:
+                    outcome = task.result()
+                except Exception as e:
+                    log.error(f"❌ Job crashed: {e}")
+                    outcome = {"scraper_error": True, "captcha_error": False}
 
-        except Exception as e:
-            log.error(f"❌ GET API call failed: {e}")
-            print("API call failed:", e)
-            return
+                if outcome["captcha_error"]:
+                    stop_reason = "captcha"
 
-        # ----------------------------------------
-        # STEP 2: PREPARE SCRAPING CONFIGURATION
-        # ----------------------------------------
-        JOB_CONFIG = {
-            "InitialURL": initial_url,
+                # VPN reconnection logic
+                if outcome["scraper_error"] or should_reconnect_vpn():
+                    if running and not vpn_reconnect_pending:
+                        log.info(f"⏸ VPN reconnection pending - waiting for {len(running)} running job(s) to finish")
+                    vpn_reconnect_pending = True
+                else:
+                    elapsed = (time.time() - last_vpn_reconnect_time) / 60
+                    log.info(f"ℹ️ VPN reconnection not needed (elapsed: {elapsed:.1f} minutes)")
+
+            # The running jobs found dockets again and the early lease waited too long for a slot
+            expired = prefetched_at is not None and time.time() - prefetched_at >= PREFETCH_MAX_WAIT
+            if expired and next_job.done() and (len(running) >= WORKER_JOB_CONCURRENCY or not can_lease()):
+                waited = time.time() - prefetched_at
+                prefetched_at = None
+                job = None if next_job.exception() else next_job.result()
+                if job is not None:
+                    log.info(f"⌛ Job leased ahead of time waited {waited:.0f}s for a slot - re-queueing it")
+                    await asyncio.to_thread(requeue_unstarted_job, job)
+                next_job = None
+    finally:
+        if wake is not None:
+            wake.cancel()
+        # A job leased ahead of time that never ran goes back to the queue
+        # (on Ctrl+C the signal handler already re-queued it)
+        if next_job is not None:
+            try:
+                job = await next_job
+            except Exception:
+                job = None
+            if job is not None and not shutdown_requested:
+                await asyncio.to_thread(requeue_unstarted_job, job)
+        await drain_finalizers(runtime)
+
+    if stop_reason == "captcha":
+        log.info("="*60)
+        log.info("🛑 Captcha Not Solved - Stopping Program")
+        log.info("Job has been re-queued. Please solve captcha manually....")
+        log.info("="*60)
+        sys.exit(0)
+
+def prepare_job(court_details: dict, api_client: ApiClient) -> dict:
+    """
+    Everything a leased job needs before its first docket: the job details,
+    JOB_CONFIG, dataset id and output directory. api_client is the blocking
+    client the shutdown handler re-queues the job with.
+    """
+
+    # Extract job details
+    record_id = court_details.get("recordId")
+    initial_url = court_details.get("InitialURL")
+    url_format = court_details.get("urlFormat")
+    county_name = court_details.get("countyName")
+    docket_year = court_details.get("docketYear")
+    docket_number = court_details.get("docketNumber")
+    docket_type = court_details.get("docketType")
+
+    # ----------------------------------------
+    # STEP 2: PREPARE SCRAPING CONFIGURATION
+    # ----------------------------------------
+    JOB_CONFIG = {
+        "InitialURL": initial_url,
+        "stateName": "WISCONSIN",
+        "stateAbbreviation": "WI",
+        "urlFormat": url_format.replace('{year}', '{docketYear}').replace('{seqNo}', '{docketNumber}'),
+        "countyNo": court_details.get("countyNo"),
+        "countyName": county_name,
+        "docketNumber": str(docket_number).zfill(6),
+        "docketType": docket_type,
+        "docketYear": docket_year
+    }
+
+    # Get output directory (keeping for potential future use)
+    today_date = datetime.now().strftime("%d-%m-%Y")
+    html_dir = get_output_directory(
+        today_date,
+        JOB_CONFIG["stateName"],
+        JOB_CONFIG["countyName"].replace(" ", "_"),
+        JOB_CONFIG["docketType"]
+    )
+
+    # Register the job for the shutdown handler as soon as it is leased, so a
+    # prefetched job that never started is re-queued too
+    job_state = {
+        "api_client": api_client,
+        "record_id": record_id,
+        "initial_url": initial_url,
+        "url_format": url_format,
+        "county_no": JOB_CONFIG["countyNo"],
+        "county_name": county_name,
+        "docket_year": docket_year,
+        "docket_type": docket_type,
+        "last_successful_docket": str(docket_number).zfill(6),
+        "winding_down": False
+    }
+    active_job_states[record_id] = job_state
+
+    return {
+        "court_details": court_details,
+        "api_client": api_client,
+        "job_state": job_state,
+        "job_config": JOB_CONFIG,
+        # Get dataset ID in format: WI-901-TR
+        "dataset_id": build_dataset_id("WI", docket_type),
+        "html_dir": html_dir
+    }
+
+async def lease_next_job(runtime: dict):
+    """
+    Lease and prepare the next job without blocking the event loop. Returns
+    the prepared job, None when the queue is empty, or raises if the GET
+    call failed.
+    """
+    court_details = await lease_job(runtime["async_api_client"])
+    if not court_details:
+        return None
+    return prepare_job(court_details, runtime["api_client"])
+
+def requeue_unstarted_job(job: dict):
+    """Give a prefetched job that never ran back to the queue from its start docket."""
+    job_state = job["job_state"]
+    active_job_states.pop(job_state["record_id"], None)
+    formatted_docket = str(job_state["last_successful_docket"]).zfill(6)
+    formatted_url = f"https://wcca.wicourts.gov/caseDetail.html?caseNo={job_state['docket_year']}{job_state['docket_type']}{formatted_docket}&countyNo={job_state['county_no']}&index=0&isAdvanced=true&mode=details"
+    add_payload = {
+        "courtOfficeDetails": {
+            "InitialURL": job_state["initial_url"],
             "stateName": "WISCONSIN",
             "stateAbbreviation": "WI",
-            "urlFormat": url_format.replace('{year}', '{docketYear}').replace('{seqNo}', '{docketNumber}'),
-            "countyNo": county_no,
-            "countyName": county_name,
-            "docketNumber": str(docket_number).zfill(6),
-            "docketType": docket_type,
-            "docketYear": docket_year
+            "urlFormat": formatted_url,
+            "countyNo": int(job_state["county_no"]),
+            "countyName": job_state["county_name"],
+            "docketNumber": int(job_state["last_successful_docket"]),
+            "docketYear": int(job_state["docket_year"]),
+            "docketType": job_state["docket_type"]
         }
+    }
+    try:
+        add_response = job["api_client"].post("/WI_Downloader_Job_To_SQS_ADD", add_payload)
+        log.info(f"↩ Prefetched job {job_state['county_name']} {job_state['docket_year']}{job_state['docket_type']} re-queued: {add_response}")
+    except Exception as e:
+        log.error(f"❌ ADD API failed for prefetched job: {e}")
+
+def finalize_in_background(runtime: dict, api_client, path: str, payload: dict, name: str):
+    """
+    Send a job's closing UPDATE/ADD call as a separate task, so the slot can
+    start its next job right away. process_jobs waits for these before
+    the worker exits.
+    """
+    async def send():
+        try:
+            response = await api_client.post(path, payload)
+            log.info(f"✅ {name} API called: {response}")
+        except Exception as e:
+            log.error(f"❌ {name} API failed: {e}")
 
-        # Get dataset ID in format: WI-901-TR
-        dataset_id = build_dataset_id("WI", docket_type)
-        
-        # Get output directory (keeping for potential future use)
-        today_date = datetime.now().strftime("%d-%m-%Y")
-        html_dir = get_output_directory(
-            today_date,
-            JOB_CONFIG["stateName"],
-            JOB_CONFIG["countyName"].replace(" ", "_"),
-            JOB_CONFIG["docketType"]
-        )
+    task = asyncio.create_task(send())
+    runtime["finalizers"].add(task)
+    task.add_done_callback(runtime["finalizers"].discard)
 
+async def run_job(job: dict, runtime: dict) -> dict:
+    """
+    Scrape one leased job from its start docket until the skip count is
+    reached, then UPDATE or re-queue (ADD) it in the background. Returns
+    which errors ended the job so the worker can decide on VPN reconnects
+    and stopping.
+    """
+    court_details = job["court_details"]
+    api_client = runtime["async_api_client"]
+    job_state = job["job_state"]
+    JOB_CONFIG = job["job_config"]
+    dataset_id = job["dataset_id"]
+
+    record_id = court_details.get("recordId")
+    initial_url = court_details.get("InitialURL")
+    url_format = court_details.get("urlFormat")
+    consecutive_skip_count = court_details.get("consecutiveSkipCount", 50)
+    county_no = court_details.get("countyNo")
+    county_name = court_details.get("countyName")
+    docket_year = court_details.get("docketYear")
+    docket_number = court_details.get("docketNumber")
+    docket_type = court_details.get("docketType")
+    job_label = f"{county_name} {docket_year}{docket_type}"
+
+    log.info(f"📋 Job Details: County={county_name}, Year={docket_year}, Type={docket_type}, StartDocket={docket_number}, SkipCount={consecutive_skip_count}")
+
+    def mark_winding_down():
+        """Let the worker lease the next job while this one finishes its last dockets."""
+        if not job_state["winding_down"]:
+            job_state["winding_down"] = True
+            runtime["prefetch_wanted"].set()
+
+    try:
         # ----------------------------------------
         # STEP 3: SCRAPING LOOP WITH SKIP COUNT LOGIC
         # ----------------------------------------
@@ -295,32 +622,149 @@ async def main():
         total_scraped = 0
         network_error_count = 0
         MAX_NETWORK_ERRORS = 3
+        dockets_attempted = 0
+        bytes_saved = 0
+        job_started_at = time.time()
+
+        def docket_config_for(number: int) -> dict:
+            docket = str(number).zfill(6)
+            docket_config = dict(JOB_CONFIG)
+            docket_config["docketNumber"] = docket
+            docket_config["case_url"] = url_format.replace('{year}', str(docket_year)).replace('{seqNo}', docket)
+            return docket_config
+
+        # ----------------------------------------
+        # OPTIONAL: FRONTIER DISCOVERY
+        # ----------------------------------------
+        # Results of frontier probes, reused by the linear pass instead of fetching twice
+        probe_results = {}
+        frontier = None
+
+        unavailable_cache = runtime["unavailable_cache"]
+
+        # Dockets past the start already uploaded (replayed from the outbox at startup, or in
+        # an earlier lease of this job) or still waiting in the outbox are not scraped again
+        upload_outbox = runtime["upload_outbox"]
+        already_uploaded = upload_outbox.uploaded_since(county_no, docket_year, docket_type, int(docket_number))
+        outbox_pending = upload_outbox.pending_for(county_no, docket_year, docket_type, int(docket_number))
+        if already_uploaded or outbox_pending:
+            log.info(f"📮 {job_label}: {len(already_uploaded)} docket(s) already uploaded and {len(outbox_pending)} waiting in the outbox - not scraped again")
+
+        async def fetch_docket(number: int):
+            """Scrape one docket, short-circuiting dockets recently confirmed unavailable or already scraped."""
+            docket = f"{docket_year}{docket_type}{str(number).zfill(6)}"
+            if number in already_uploaded:
+                return {"docket": docket, "html": "", "status": "ok", "already_uploaded": True}
+            if number in outbox_pending:
+                return {"docket": docket, "html": "", "status": "ok", "outbox_entry": outbox_pending.pop(number)}
+            if unavailable_cache.is_unavailable(county_no, docket_year, docket_type, number):
+                return {"docket": docket, "html": "", "status": "unavailable", "cached": True}
+
+            results = await scrape_on_session(runtime["session_pool"], docket_config_for(number),
+                                            runtime.get("rate_limiter"), runtime.get("rate_controller"))
+            # Only a docket whose "no record" notice was actually seen is remembered; timeouts
+            # and unknown page states also come back as unavailable but may well exist
+            if (results is not None and results.get("status") == "unavailable"
+                    and results.get("unavailable_confirmed") and not results.get("timed_out")):
+                unavailable_cache.mark_unavailable(county_no, docket_year, docket_type, number)
+            elif results is not None and results.get("status") == "ok":
+                unavailable_cache.forget(county_no, docket_year, docket_type, number)
+            return results
+
+        async def probe_docket(number: int) -> bool:
+            results = await fetch_docket(number)
+            if results is None or results.get("status") not in ("ok", "unavailable"):
+                raise FrontierProbeError(f"probe of docket {number} failed")
+            probe_results[number] = results
+            return results["status"] == "ok"
+
+        if FRONTIER_MODE:
+            try:
+                frontier = await find_docket_frontier(probe_docket, int(docket_number), int(consecutive_skip_count))
+            except FrontierProbeError as e:
+                log.warning(f"⚠ Frontier discovery aborted ({e}) - falling back to linear probing.")
+
+        # Scrapes in flight keyed by docket offset. Up to SCRAPE_CONCURRENCY consecutive
+        # dockets load at once, but results are consumed strictly in docket order below.
+        in_flight = {}
+
+        def schedule_scrape(offset: int):
+            number = start_number + offset
+            if number in probe_results:
+                in_flight[offset] = asyncio.create_task(replay_result(probe_results.pop(number)))
+                return
+            in_flight[offset] = asyncio.create_task(fetch_docket(number))
+
+        # Successful dockets are uploaded by background tasks while scraping goes on; the
+        # job's position only advances over the unbroken run of dockets the API confirmed
+        def on_insert_result(seq_no: int, ok: bool, detail):
+            nonlocal total_scraped
+            inserted_case_no = f"{docket_year}{docket_type}{str(seq_no).zfill(6)}"
+            if not ok:
+                log.error(f"❌ INSERT API failed for {inserted_case_no}: {detail}")
+                return
+            if uploads.max_items == 1:
+                log.info(f"📤 INSERT API called for {inserted_case_no}: {detail}")
+            total_scraped += 1
+
+        def on_insert_advance(seq_no: int):
+            # ONLY update tracking variables once every earlier INSERT succeeded
+            nonlocal last_successful_docket, last_inserted_docket
+            last_successful_docket = str(seq_no).zfill(6)
+            last_inserted_docket = last_successful_docket  # Track last INSERTED
+            job_state["last_successful_docket"] = last_successful_docket
+
+        uploads = UploadQueue(
+            api_client, on_result=on_insert_result, on_advance=on_insert_advance,
+            outbox=runtime["upload_outbox"]
+        )
+        uploads.start()
 
         i = 0
         while not shutdown_requested:
+            # An INSERT that failed even after retries stops the job, as before
+            if uploads.failed:
+                scraper_error_occurred = True
+                break
+
+            # Past a known frontier, look ahead no further than the misses the tail still allows
+            look_ahead_limit = None
+            if frontier is not None:
+                tail_left = FRONTIER_TAIL_SKIP
+                if start_number + i > frontier:
+                    tail_left -= consecutive_failures
+                look_ahead_limit = max(frontier, start_number + i - 1) + tail_left
+
+            for offset in range(i, i + SCRAPE_CONCURRENCY):
+                if look_ahead_limit is not None and start_number + offset > look_ahead_limit:
+                    break
+                if offset not in in_flight:
+                    schedule_scrape(offset)
+
             current_docket_number = str(start_number + i).zfill(6)
             JOB_CONFIG["docketNumber"] = current_docket_number
 
             # Build case number and URL
             case_no = f"{JOB_CONFIG['docketYear']}{JOB_CONFIG['docketType']}{current_docket_number}"
-            
+
             # Replace placeholders in URL format
             final_url = url_format.replace('{year}', str(docket_year)).replace('{seqNo}', current_docket_number)
-            
+
             log.info(f"🔍 Scraping docket: {case_no} -> {final_url}")
 
             # ----------------------------------------
             # SCRAPE THE PAGE
             # ----------------------------------------
-            JOB_CONFIG["case_url"] = final_url
-            scraper = WisconsinScraper(config=JOB_CONFIG)
-            results = await scraper.run_scraper()
+            results = await in_flight.pop(i)
+            dockets_attempted += 1
+            if results and results.get("resource_stats"):
+                bytes_saved += results["resource_stats"]["estimated_bytes_saved"]
 
             # ❌ CASE 1 – SCRAPER FAILURE (Critical Error)
             if results is None:
                 log.error(f"❌ Scraper failed critically for case {case_no}.")
                 network_error_count += 1
-                
+
                 # Check if this is a persistent network issue
                 if network_error_count >= MAX_NETWORK_ERRORS:
                     log.error(f"🚨 Multiple network errors ({network_error_count}). Pausing before retry...")
@@ -338,18 +782,35 @@ async def main():
             # Check scraper status
             html_content = results.get("html", "")
             scraper_status = results.get("status", "ok")
-            
-            # CAPTCHA failure - stop immediately
+
+            # CAPTCHA failure - move the docket to another session, stop once all are blocked
             if scraper_status == "failed":
                 log.error(f"❌ Scraper reported CAPTCHA failure for case {case_no}")
+                if runtime["session_pool"].available_sessions():
+                    log.warning(f"🔁 Retrying {case_no} on another session ({runtime['session_pool'].status()})")
+                    continue
                 captcha_error_occurred = True
                 break
-            
+
             # Case unavailable - legitimate skip
             if scraper_status == "unavailable":
-                log.warning(f"⚠ Case {case_no} indicates 'no record found'.")
+                if results.get("cached"):
+                    log.warning(f"⚠ Case {case_no} was recently confirmed unavailable - skipped without fetching.")
+                else:
+                    log.warning(f"⚠ Case {case_no} indicates 'no record found'.")
                 consecutive_failures += 1
-                
+
+                # With a known frontier, a short run of misses past it ends the job; any
+                # docket still found there resets the run and the pass carries on
+                past_frontier = frontier is not None and start_number + i > frontier
+                miss_limit = FRONTIER_TAIL_SKIP if past_frontier else consecutive_skip_count
+                if consecutive_failures * 2 >= miss_limit:
+                    mark_winding_down()
+
+                if past_frontier and consecutive_failures >= FRONTIER_TAIL_SKIP:
+                    log.info(f"🧭 {consecutive_failures} dockets missing past frontier {frontier} - stopping.")
+                    break
+
                 # Check if we've hit the skip count limit
                 if consecutive_failures >= consecutive_skip_count:
                     log.info(f"🛑 Reached consecutive skip count limit ({consecutive_skip_count}). Stopping.")
@@ -358,7 +819,22 @@ async def main():
                     log.info(f"⏭ Skipping to next docket. Failures: {consecutive_failures}/{consecutive_skip_count}")
                     i += 1
                     continue
-            
+
+            # Uploaded before, or scraped before and still in the outbox: counts as found,
+            # but is not inserted a second time
+            if results.get("already_uploaded") or results.get("outbox_entry"):
+                consecutive_failures = 0
+                job_state["winding_down"] = False
+                if results.get("already_uploaded"):
+                    log.info(f"📮 Case {case_no} already uploaded - skipped.")
+                    uploads.skip_uploaded(int(current_docket_number))
+                else:
+                    outbox_id, outbox_payload = results["outbox_entry"]
+                    log.info(f"📮 Case {case_no} taken from the upload outbox.")
+                    await uploads.put(int(current_docket_number), outbox_payload, outbox_id=outbox_id)
+                i += 1
+                continue
+
             # Additional safety check for empty HTML
             if not html_content:
                 log.error(f"❌ Empty HTML received for case {case_no} (network error)")
@@ -372,9 +848,10 @@ async def main():
 
             # ✅ SUCCESS - Send to INSERT API (NO HTML SAVING)
             consecutive_failures = 0  # Reset failure counter
-            
+            job_state["winding_down"] = False  # Found dockets again; a later run of misses asks anew
+
             # ----------------------------------------
-            # SEND TO INSERT API IMMEDIATELY
+            # HAND OFF TO THE UPLOAD QUEUE
             # ----------------------------------------
             insert_payload = {
                 "agencyID": int(county_no),  # Convert to integer
@@ -386,39 +863,56 @@ async def main():
                 "docketType": docket_type,
                 "emailID": ""
             }
-            
-            try:
-                insert_response = api_client.post("/WI_CounterBasedEntry_INSERT", insert_payload)
-                log.info(f"📤 INSERT API called for {case_no}: {insert_response}")
-                
-                # ONLY update tracking variables if INSERT was successful
-                last_successful_docket = current_docket_number
-                last_inserted_docket = current_docket_number  # Track last INSERTED
-                current_job_state["last_successful_docket"] = current_docket_number
-                total_scraped += 1
-                
-            except Exception as e:
-                log.error(f"❌ INSERT API failed for {case_no}: {e}")
-                # If INSERT fails, treat it as an error and break
-                scraper_error_occurred = True
-                break
-            
+
+            # Structured case JSON captured from the page's XHRs
+            case_payload = results.get("payload")
+            if case_payload and CAPTURE_MODE in ("payload", "both"):
+                insert_payload["caseData"] = case_payload
+                if CAPTURE_MODE == "payload":
+                    insert_payload["htmlContent"] = ""
+                    log.info(f"📦 Uploading case payload ({len(json.dumps(case_payload))} bytes) instead of HTML ({len(html_content)} bytes)")
+
+            # Waits only when the upload queue is full (uploads falling behind)
+            await uploads.put(int(current_docket_number), insert_payload)
+
             i += 1
 
+        # Drop look-ahead scrapes past the point where the job stopped
+        for task in in_flight.values():
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+        # Let the uploaders finish before deciding between UPDATE and ADD
+        await uploads.close()
+        if uploads.failed:
+            scraper_error_occurred = True
+
         # ----------------------------------------
         # STEP 4: DETERMINE FINAL API CALL (UPDATE OR ADD)
         # ----------------------------------------
         log.info("\n" + "="*60)
-        log.info(f"📊 Scraping Summary: Total Scraped = {total_scraped}, Last Successful = {last_successful_docket}")
+        log.info(f"📊 Scraping Summary ({job_label}): Total Scraped = {total_scraped}, Last Successful = {last_successful_docket}")
+        elapsed_minutes = (time.time() - job_started_at) / 60
+        if elapsed_minutes > 0:
+            log.info(f"⏱ Throughput: {dockets_attempted} dockets in {elapsed_minutes:.1f} min ({dockets_attempted / elapsed_minutes:.1f} dockets/min)")
+        if runtime.get("rate_controller") is not None and runtime["rate_controller"].enabled:
+            log.info(f"🚦 Request rate now {runtime['rate_controller'].rate:.2f} req/s")
+        if uploads.max_items > 1:
+            log.info(f"📤 {total_scraped} dockets inserted in {uploads.batches_sent} INSERT batches")
+        if uploads.backpressure_seconds >= 1:
+            log.info(f"⏳ Scraping waited {uploads.backpressure_seconds:.0f}s for the upload queue")
+        if bytes_saved:
+            log.info(f"🧹 Resource blocking saved ~{bytes_saved / (1024 * 1024):.1f} MB this job")
         log.info("="*60)
-        
+
         # ISSUE 2 FIX: Handle CAPTCHA and scraper errors by calling ADD API
         if scraper_error_occurred or captcha_error_occurred:
             # ❌ ERROR OCCURRED - USE ADD API with last SUCCESSFULLY INSERTED docket
             error_type = "CAPTCHA" if captcha_error_occurred else "Network"
-            log.info(f"\n🚨 {error_type} error occurred - Calling ADD API to re-queue job")
+            log.info(f"\n🚨 {error_type} error occurred - Calling ADD API to re-queue job {job_label}")
             log.info(f"   Re-queuing from last successfully inserted: {last_inserted_docket}")
-            
+
             # Format the URL with actual values
             formatted_docket = str(last_inserted_docket).zfill(6)
             formatted_url = f"https://wcca.wicourts.gov/caseDetail.html?caseNo={docket_year}{docket_type}{formatted_docket}&countyNo={county_no}&index=0&isAdvanced=true&mode=details"
@@ -437,31 +931,22 @@ async def main():
                 }
             }
             # log.info(f"   ADD API payload: {add_payload}")
-            try:
-                add_response = api_client.post("/WI_Downloader_Job_To_SQS_ADD", add_payload)
-                log.info(f"✅ ADD API called: {add_response}")
-            except Exception as e:
-                log.error(f"❌ ADD API failed: {e}")
-
-            if captcha_error_occurred:
-                log.info("="*60)
-                log.info("🛑 Captcha Not Solved - Stopping Program")
-                log.info("Job has been re-queued. Please solve captcha manually....")
-                log.info("="*60)
-                sys.exit(0)
-                
-            # Add delay before fetching next job after errors
-            log.info("⏸ Waiting 60 seconds before fetching next job due to errors...")
-            await asyncio.sleep(60)
-                
+            finalize_in_background(runtime, api_client, "/WI_Downloader_Job_To_SQS_ADD", add_payload, "ADD")
+
+            # Add delay before this slot fetches its next job after errors
+            # (an unsolved captcha stops the worker instead, see process_jobs)
+            if not captcha_error_occurred:
+                log.info("⏸ Waiting 60 seconds before fetching next job due to errors...")
+                await asyncio.sleep(60)
+
         else:
             # ✅ SUCCESS - USE UPDATE API
             if total_scraped > 0:
-                log.info("\n✅ Scraping successful - Calling UPDATE API")
-                
+                log.info(f"\n✅ Scraping successful - Calling UPDATE API for {job_label}")
+
                 # Convert docket number to integer (remove leading zeros)
                 docket_number_int = int(last_successful_docket)
-                
+
                 update_payload = {
                     "recordId": record_id,
                     "docketYear": int(docket_year),
@@ -469,26 +954,14 @@ async def main():
                 }
                 # log.info(f"   UPDATE API payload: {update_payload}")
                 log.info(f"   Updating to docket: {docket_number_int}")
-                
-                try:
-                    update_response = api_client.post("/WI_County_DocketNumber_UPDATE", update_payload)
-                    log.info(f"✅ UPDATE API called: {update_response}")
-                except Exception as e:
-                    log.error(f"❌ UPDATE API failed: {e}")
+
+                finalize_in_background(runtime, api_client, "/WI_County_DocketNumber_UPDATE", update_payload, "UPDATE")
             else:
                 log.info("ℹ️ No new data scraped - No UPDATE call needed")
-        
-        # VPN reconnection logic
-        needs_vpn_reconnect = scraper_error_occurred or should_reconnect_vpn()
-        
-        if needs_vpn_reconnect:
-            reconnect_vpn_if_needed()
-        else:
-            elapsed = (time.time() - last_vpn_reconnect_time) / 60
-            log.info(f"ℹ️ VPN reconnection not needed (elapsed: {elapsed:.1f} minutes)")
-        
-        log.info("🔄 Fetching next job from queue...")
-        await asyncio.sleep(2)
+
+        return {"scraper_error": scraper_error_occurred, "captcha_error": captcha_error_occurred}
+    finally:
+        active_job_states.pop(record_id, None)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
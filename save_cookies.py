@@ -7,7 +7,7 @@ COOKIE_FILE = "wcca_cookies.json"
 WCCA_URL = "https://wcca.wicourts.gov"
 
 
-async def save_wcca_cookies():
+async def save_wcca_cookies(cookie_file: str = COOKIE_FILE):
     print("Launching browser...")
 
     async with async_playwright() as p:
@@ -32,10 +32,10 @@ async def save_wcca_cookies():
 
         cookies = await context.cookies()
 
-        with open(COOKIE_FILE, "w", encoding="utf-8") as f:
+        with open(cookie_file, "w", encoding="utf-8") as f:
             json.dump(cookies, f, indent=2)
 
-        print(f"✅ Cookies saved to {COOKIE_FILE}")
+        print(f"✅ Cookies saved to {cookie_file}")
         await browser.close()
 
 
@@ -1,68 +1,67 @@
 # scrapers/html_to_json.py
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import re
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import sys
+import json
+import time
+import argparse
+from typing import Optional, Dict, Any, List, Union
 
+from config import HTML_PARSER, HTML_CONTENT_ONLY
+from scrapers.normalizers import (
+    parse_money as _parse_money,
+    iso_date_from_mm_dd_yyyy as _iso_date_from_mm_dd_yyyy,
+    parse_address as _parse_address
+)
+from utils.logger import log
 
-def _clean_text(node):
-    if node is None:
-        return ""
-    text = " ".join(node.get_text(separator=" ", strip=True).split())
-    return text if text != "\xa0" else ""
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+except ImportError:
+    lxml = None
 
+LXML = "lxml"
+HTML_PARSER_STDLIB = "html.parser"
+BACKENDS = (LXML, HTML_PARSER_STDLIB)
 
-def _parse_money(text: str) -> Optional[float]:
-    if not text:
-        return None
-    # remove commas, dollar signs
-    m = re.search(r"-?\$?([\d,]+(?:\.\d+)?)", text)
-    if not m:
-        return None
-    try:
-        return float(m.group(1).replace(",", ""))
-    except:
-        return None
+_lxml_warned = False
+
+# Only div.content-column (and everything inside it) becomes part of the tree; the
+# regex matches the class token, as the class attribute is still a plain string here
+CONTENT_COLUMN_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)content-column(?:\s|$)"))
 
 
-def _iso_date_from_mm_dd_yyyy(text: str) -> Optional[str]:
+def resolve_backend(backend: str = HTML_PARSER) -> str:
     """
-    Converts '11-25-2025' or '11-25-2025 08:15 am' to '2025-11-25'.
-    If text looks like '11-25-2025' returns '2025-11-25'.
-    If text is '05-1989' returns '05-1989' (leave DOB monthly-year format).
+    Map an HTML_PARSER setting to a BeautifulSoup tree builder: "auto" picks
+    lxml when it is installed, "lxml" falls back to html.parser (with a
+    warning) when it is not.
     """
-    if not text:
-        return None
-    text = text.strip()
-    # try mm-dd-yyyy
-    m = re.match(r"(\d{1,2})-(\d{1,2})-(\d{4})", text)
-    if m:
-        mm, dd, yyyy = m.groups()
-        try:
-            d = datetime(int(yyyy), int(mm), int(dd))
-            return d.strftime("%Y-%m-%d")
-        except:
-            return f"{yyyy}-{mm.zfill(2)}-{dd.zfill(2)}"
-    # try mm-yyyy (DOB style)
-    m2 = re.match(r"(\d{1,2})-(\d{4})$", text)
-    if m2:
-        mm, yyyy = m2.groups()
-        return f"{mm.zfill(2)}-{yyyy}"  # keep as '05-1989' style
-    # fallback: try parse yyyy-mm-dd-like
-    try:
-        d = datetime.fromisoformat(text.split()[0])
-        return d.date().isoformat()
-    except:
-        return None
+    global _lxml_warned
+    backend = (backend or "auto").lower()
+    if backend == "auto":
+        return LXML if lxml is not None else HTML_PARSER_STDLIB
+    if backend == LXML and lxml is None:
+        if not _lxml_warned:
+            log.warning("⚠ lxml is not installed - parsing case HTML with html.parser")
+            _lxml_warned = True
+        return HTML_PARSER_STDLIB
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend {backend!r} (expected auto, lxml or html.parser)")
+    return backend
 
 
-def _extract_dl_pairs_from_dl_section(section):
-    """
-    Accepts a soup section that contains a series of <dl><dt>Label</dt><dd>Value</dd></dl>.
-    Returns a dict label->value
-    """
+def _clean_text(node):
+    if node is None:
+        return ""
+    text = " ".join(node.get_text(separator=" ", strip=True).split())
+    return text if text != "\xa0" else ""
+
+
+def _dl_pairs(dls) -> Dict[str, str]:
+    """label->value for a list of <dl><dt>Label</dt><dd>Value</dd></dl> elements."""
     data = {}
-    for dl in section.find_all("dl"):
+    for dl in dls:
         dt = dl.find("dt")
         dd = dl.find("dd")
         if not dt:
@@ -73,121 +72,178 @@ def _extract_dl_pairs_from_dl_section(section):
     return data
 
 
-def _parse_address(addr: str) -> Dict[str, Optional[str]]:
+CHARGE_TABLE_CLASS_RE = re.compile(r"charge-summary|group-colored", re.I)
+CITATION_NUMBER_RE = re.compile(r'Citation\s+(\S+)', re.I)
+BOND_AMOUNT_RE = re.compile(r"Bond amount", re.I)
+FILING_DATE_RE = re.compile(r"Filing date", re.I)
+ADDITIONAL_TEXT_RE = re.compile(r'^\s*Additional\s*text\s*:\s*(.*)', re.I)
+
+
+class _SectionIndex:
     """
-    Parse an address string like:
-      - "18410 South St Apt 12, Whitehall, WI 54773"
-      - "5367 Eagle St, White Bear Lake, MN 55110"
-      - "123 Main St, Smalltown WI 12345" (no comma before state)
-    Returns dict with keys: line1, city, state, zip
+    Everything the extractor looks up in the content column, collected in
+    one walk of the tree instead of a find()/find_all() per section and per
+    table row: the first <section> for each id, the <dl>, <table> and
+    div.citation elements inside each of them (document order), the
+    tbody/tr/td structure of those tables, and the county name, caption and
+    first <h4>. dl_pairs() turns a section's <dl>s into its label->value map
+    once and keeps it.
+
+    Table parts are keyed by id() of the containing element, since bs4 tags
+    compare by content.
     """
-    if not addr:
-        return {"line1": None, "city": None, "state": None, "zip": None}
-
-    addr = addr.strip()
-    # Normalize multiple spaces
-    addr = " ".join(addr.split())
-
-    # If there are 3+ comma-separated parts, assume: line1, city, state_zip (extra commas in street handled by joining)
-    parts = [p.strip() for p in addr.split(",")]
-    if len(parts) >= 3:
-        line1 = parts[0]
-        # join middle parts except last as city (handles "City, Extra" edgecases)
-        city = ", ".join(parts[1:-1]).strip()
-        state_zip = parts[-1]
-    elif len(parts) == 2:
-        # Parts: [line1, city + state_zip] OR [line1, city state zip]
-        line1 = parts[0]
-        state_zip = parts[1]
-        # Try to split state_zip into city/state/zip by regex: look for last ' STATE ZIP' pattern
-        # If it doesn't match, treat everything before last two tokens as city.
-        m = re.search(r"(.*)\b([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\s*$", state_zip)
-        if m:
-            city = m.group(1).strip()
-            state_zip = f"{m.group(2)} {m.group(3)}"
-        else:
-            # fallback: try to split the state_zip by whitespace, assume last two tokens state+zip or last token state
-            toks = state_zip.split()
-            if len(toks) >= 2 and re.match(r"^[A-Za-z]{2}$", toks[-2]) and re.match(r"^\d{5}(?:-\d{4})?$", toks[-1]):
-                city = " ".join(toks[:-2])
-                state_zip = f"{toks[-2]} {toks[-1]}"
-            else:
-                # can't reliably split, assume everything is city
-                city = state_zip
-                state_zip = ""
-    else:
-        # No comma at all — try to parse from the end using regex
-        line1 = None
-        city = None
-        state_zip = addr
-        m = re.search(r"(.*?),?\s*([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\s*$", addr)
-        if m:
-            line1 = m.group(1).strip()
-            # fallback: treat line1 as combined and then split
-            parts2 = line1.split(",")
-            if len(parts2) >= 2:
-                line1 = parts2[0].strip()
-                city = parts2[1].strip()
-            else:
-                # unknown: set line1 as first chunk
-                line1 = parts2[0].strip()
-            state_zip = f"{m.group(2)} {m.group(3)}"
-
-    # Now parse state_zip for state and zip
-    state = None
-    zipc = None
-    if state_zip:
-        m2 = re.search(r"([A-Za-z]{2})\s*(\d{5}(?:-\d{4})?)?", state_zip)
-        if m2:
-            state = m2.group(1)
-            zipc = m2.group(2) if m2.group(2) else None
-
-    # Final trims and normalization
-    def _none_if_empty(x: Optional[str]) -> Optional[str]:
-        if x is None:
-            return None
-        x = x.strip()
-        return x if x != "" else None
-
-    return {
-        "line1": _none_if_empty(line1),
-        "city": _none_if_empty(city),
-        "state": _none_if_empty(state),
-        "zip": _none_if_empty(zipc)
-    }
+
+    def __init__(self, root):
+        self.sections: Dict[str, Tag] = {}
+        self.dls: Dict[str, List[Tag]] = {}
+        self.tables: Dict[str, List[Tag]] = {}
+        self.citations: Dict[str, List[Tag]] = {}
+        self.tbodies: Dict[int, List[Tag]] = {}  # id(table) -> tbody elements
+        self.rows: Dict[int, List[Tag]] = {}     # id(tbody) -> tr elements
+        self.cells: Dict[int, List[Tag]] = {}    # id(tr) -> td / th elements
+        self.county_span = None
+        self.caption = None
+        self.first_h4 = None
+        self._pairs: Dict[str, Dict[str, str]] = {}
+        self._walk(root, (), (), (), ())
+
+    def _walk(self, node, open_sections: tuple, open_tables: tuple, open_tbodies: tuple, open_rows: tuple):
+        for child in node.contents:
+            if not isinstance(child, Tag):
+                continue
+            name = child.name
+            inner = open_sections
+            tables, tbodies, rows = open_tables, open_tbodies, open_rows
+            if name == "section":
+                section_id = child.get("id")
+                if section_id and section_id not in self.sections:
+                    self.sections[section_id] = child
+                    inner = open_sections + (section_id,)
+            elif name == "td" or name == "th":
+                for tr in open_rows:
+                    self.cells[id(tr)].append(child)
+            elif name == "tr":
+                if open_sections:
+                    for tbody in open_tbodies:
+                        self.rows[id(tbody)].append(child)
+                    self.cells[id(child)] = []
+                    rows = open_rows + (child,)
+            elif name == "tbody":
+                if open_sections:
+                    for table in open_tables:
+                        self.tbodies[id(table)].append(child)
+                    self.rows[id(child)] = []
+                    tbodies = open_tbodies + (child,)
+            elif name == "dl":
+                for section_id in open_sections:
+                    self.dls.setdefault(section_id, []).append(child)
+            elif name == "table":
+                for section_id in open_sections:
+                    self.tables.setdefault(section_id, []).append(child)
+                if open_sections:
+                    self.tbodies[id(child)] = []
+                    tables = open_tables + (child,)
+            elif name == "div":
+                if "citation" in (child.get("class") or ()):
+                    for section_id in open_sections:
+                        self.citations.setdefault(section_id, []).append(child)
+            elif name == "span":
+                classes = child.get("class") or ()
+                if self.county_span is None and "countyName" in classes:
+                    self.county_span = child
+                if self.caption is None and "caption" in classes:
+                    self.caption = child
+            elif name == "h4" and self.first_h4 is None:
+                self.first_h4 = child
+            if child.contents:
+                self._walk(child, inner, tables, tbodies, rows)
+
+    def section(self, section_id: str):
+        return self.sections.get(section_id)
+
+    def dl_pairs(self, section_id: str) -> Dict[str, str]:
+        if section_id not in self._pairs:
+            self._pairs[section_id] = _dl_pairs(self.dls.get(section_id, ()))
+        return self._pairs[section_id]
+
+    def table_bodies(self, table) -> List[Tag]:
+        """table.find_all("tbody")"""
+        return self.tbodies.get(id(table), [])
+
+    def body_rows(self, tbody) -> List[Tag]:
+        """tbody.find_all("tr")"""
+        return self.rows.get(id(tbody), [])
+
+    def row_cells(self, tr, names=("td",)) -> List[Tag]:
+        """tr.find_all(names)"""
+        return [cell for cell in self.cells.get(id(tr), ()) if cell.name in names]
+
+    def first_table(self, section_id: str, class_re=None):
+        for table in self.tables.get(section_id, ()):
+            if class_re is None or any(class_re.search(c) for c in (table.get("class") or ())):
+                return table
+        return None
 
 
-def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -> Dict[str, Any]:
+def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None,
+                            backend: str = HTML_PARSER, content_only: bool = HTML_CONTENT_ONLY) -> Dict[str, Any]:
     """
     Read html_path, parse it, and return dict structured per user's final JSON example.
     """
     with open(html_path, "r", encoding="utf-8") as f:
         html = f.read()
 
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_html_to_json(html, job_config, backend, content_only)
+
+
+def parse_html_to_json(html: Union[str, bytes], job_config: Optional[dict] = None,
+                       backend: str = HTML_PARSER, content_only: bool = HTML_CONTENT_ONLY) -> Dict[str, Any]:
+    """
+    Parse a case page already in memory (e.g. straight from the scraper) into
+    the same dict parse_html_file_to_json returns. Bytes are read as UTF-8.
+    backend is "auto", "lxml" or "html.parser"; both builders give the same
+    result on WCCA pages (see compare_backends), lxml faster.
+
+    With content_only, only div.content-column is built into a tree
+    (navigation, scripts and footer are skipped while the page is read);
+    pages without a content column are parsed in full, as before.
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8")
+
+    builder = resolve_backend(backend)
+    content_col = None
+    if content_only:
+        soup = BeautifulSoup(html, builder, parse_only=CONTENT_COLUMN_STRAINER)
+        content_col = soup.find("div", class_="content-column")
 
-    content_col = soup.find("div", class_="content-column")
+    if content_col is None:
+        soup = BeautifulSoup(html, builder)
+        content_col = soup.find("div", class_="content-column")
     if content_col is None:
         # fallback to whole soup
         content_col = soup
 
+    # One walk over the content column; everything below reads from it
+    index = _SectionIndex(content_col)
+
     result: Dict[str, Any] = {}
     # state and county
     state_abbr = (job_config.get("stateAbbreviation") if job_config else None) or ""
     result["state"] = state_abbr
     county_name = ""
-    county_span = content_col.find("span", class_="countyName")
+    county_span = index.county_span
     if county_span:
         county_name = _clean_text(county_span)
     result["county"] = county_name.strip()
 
     # header: caption, case number
-    caption_node = content_col.find("span", class_="caption")
+    caption_node = index.caption
     if caption_node:
         result["caption"] = _clean_text(caption_node)
     else:
         # fallback: look for h4 with caption
-        h4 = content_col.find("h4")
+        h4 = index.first_h4
         if h4:
             txt = _clean_text(h4)
             # heuristic: after 'caption' (if included)
@@ -209,9 +265,10 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
     }
 
     # summary section dl fields
-    summary_section = content_col.find("section", id="summary")
+    summary_address = None
+    summary_section = index.section("summary")
     if summary_section:
-        summary_map = _extract_dl_pairs_from_dl_section(summary_section)
+        summary_map = index.dl_pairs("summary")
         # map likely names
         if "filing date" in summary_map:
             docket_info["filing_date"] = _iso_date_from_mm_dd_yyyy(summary_map["filing date"])
@@ -220,7 +277,6 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
         if "case status" in summary_map:
             docket_info["case_status"] = summary_map["case status"]
         # Extract address from summary
-        summary_address = None
         for key in summary_map.keys():
             if key.startswith("address"):
                 summary_address = summary_map[key]
@@ -229,9 +285,8 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # citations section - there may be one or more .citation blocks
     citations = []
-    cit_section = content_col.find("section", id="citations")
-    if cit_section:
-        for cit in cit_section.find_all("div", class_="citation"):
+    if index.section("citations"):
+        for cit in index.citations.get("citations", ()):
             # citation number header
             header = cit.find("h5", class_="detailHeader")
             citation_label = _clean_text(header) if header else ""
@@ -239,7 +294,7 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
             # Extract citation number from header like "Citation BK1292303"
             citation_number = None
             if citation_label:
-                m = re.search(r'Citation\s+(\S+)', citation_label, re.I)
+                m = CITATION_NUMBER_RE.search(citation_label)
                 if m:
                     citation_number = m.group(1).strip()
             
@@ -248,19 +303,12 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
             fields = {}
             if detail:
                 # parse dl groups
-                for dl in detail.find_all("dl"):
-                    dt = dl.find("dt")
-                    dd = dl.find("dd")
-                    if not dt:
-                        continue
-                    key = _clean_text(dt).lower()
-                    val = _clean_text(dd)
-                    fields[key] = val
+                fields = _dl_pairs(detail.find_all("dl"))
             
             # Extract bond amount
             bond_val = None
             if detail:
-                bond_dd = detail.find("dt", string=re.compile(r"Bond amount", re.I))
+                bond_dd = detail.find("dt", string=BOND_AMOUNT_RE)
                 if bond_dd:
                     dd = bond_dd.find_next_sibling("dd")
                     if dd:
@@ -303,18 +351,17 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # fallback: parse charges table in charges section (if citations empty)
     if not citations:
-        charge_section = content_col.find("section", id="charges")
-        if charge_section:
-            charge_table = charge_section.find("table", class_=re.compile(r"charge-summary|group-colored", re.I))
+        if index.section("charges"):
+            charge_table = index.first_table("charges", CHARGE_TABLE_CLASS_RE)
             if charge_table:
                 # Find all tbody elements (each charge+modifier is in separate tbody)
-                tbodies = charge_table.find_all("tbody")
+                tbodies = index.table_bodies(charge_table)
                 for tbody in tbodies:
-                    rows = tbody.find_all("tr")
+                    rows = index.body_rows(tbody)
                     current_count = None
                     
                     for tr in rows:
-                        tds = [_clean_text(td) for td in tr.find_all(["td", "th"])]
+                        tds = [_clean_text(td) for td in index.row_cells(tr, ("td", "th"))]
                         
                         # Check if this is a modifier row
                         is_modifier_row = (tr.get("class") and "modifier" in str(tr.get("class")))
@@ -357,10 +404,9 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # persons: defendant, plaintiff, prosecuting_agency, officer
     persons = []
-    defendant_section = content_col.find("section", id="defendant")
-    if defendant_section:
+    if index.section("defendant"):
         # extract main defendant dl fields
-        def_map = _extract_dl_pairs_from_dl_section(defendant_section)
+        def_map = index.dl_pairs("defendant")
         # name
         name_raw = def_map.get("defendant name") or def_map.get("defendant name")
         if name_raw:
@@ -405,14 +451,13 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
             persons[0]["address"]["zip"] = parsed_addr["zip"]
 
     # plaintiff / prosecuting agency - from charges section top fields
-        charges_section = content_col.find("section", id="charges")
         prosecutor = None
         prosecutor_attny = None
         responsible_official = None
         plaintiff_agency = None
 
-        if charges_section:
-            charge_map = _extract_dl_pairs_from_dl_section(charges_section)
+        if index.section("charges"):
+            charge_map = index.dl_pairs("charges")
             # responsible official/prosecuting agency/prosecuting agency attorney
             prosecutor = charge_map.get("prosecuting agency")
             prosecutor_attny = charge_map.get("prosecuting agency attorney")
@@ -456,13 +501,11 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # court_activities: parse activities table
     activities = []
-    activities_section = content_col.find("section", id="activities")
-    if activities_section:
-        table = activities_section.find("table")
+    if index.section("activities"):
+        table = index.first_table("activities")
         if table:
-            thead = [ _clean_text(th) for th in table.find_all("th") ]
-            for tr in table.find("tbody").find_all("tr"):
-                tds = [ _clean_text(td) for td in tr.find_all("td") ]
+            for tr in index.body_rows(index.table_bodies(table)[0]):
+                tds = [ _clean_text(td) for td in index.row_cells(tr) ]
                 if not tds:
                     continue
                 # map columns by position heuristically
@@ -479,14 +522,13 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # court_records: parse records table
     records = []
-    records_section = content_col.find("section", id="records")
-    if records_section:
-        table = records_section.find("table")
+    if index.section("records"):
+        table = index.first_table("records")
         if table:
             # rows may be in multiple tbody groups
-            for tbody in table.find_all("tbody"):
-                for tr in tbody.find_all("tr"):
-                    tds = [ _clean_text(td) for td in tr.find_all("td") ]
+            for tbody in index.table_bodies(table):
+                for tr in index.body_rows(tbody):
+                    tds = [ _clean_text(td) for td in index.row_cells(tr) ]
                     if not tds:
                         continue
                     # expected: Date, Event, Court official, Court reporter, Amount
@@ -501,10 +543,9 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
 
     # --- POST-PROCESS: merge "Additional text:" rows into previous record as "additional_text" ---
     merged_records: List[Dict[str, Any]] = []
-    additional_re = re.compile(r'^\s*Additional\s*text\s*:\s*(.*)', re.I)
     for rec in records:
         event_text = rec.get("event") or ""
-        m = additional_re.match(event_text)
+        m = ADDITIONAL_TEXT_RE.match(event_text)
         if rec.get("date") is None and m:
             add_txt = m.group(1).strip()
             if merged_records:
@@ -537,7 +578,7 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
     # if filing_date None, try top-level summary again
     if not docket_info.get("filing_date"):
         if summary_section:
-            dd = summary_section.find("dt", string=re.compile(r"Filing date", re.I))
+            dd = summary_section.find("dt", string=FILING_DATE_RE)
             if dd:
                 filing = _clean_text(dd.find_next_sibling("dd"))
                 docket_info["filing_date"] = _iso_date_from_mm_dd_yyyy(filing)
@@ -560,4 +601,54 @@ def parse_html_file_to_json(html_path: str, job_config: Optional[dict] = None) -
         if isinstance(v, str):
             result[k] = _norm(v)
 
-    return result
\ No newline at end of file
+    return result
+
+
+def compare_backends(paths: List[str], job_config: Optional[dict] = None) -> Dict[str, Any]:
+    """
+    Parse every file with each installed backend, with a full and a
+    content-column-only tree, and report the files whose output differs from
+    a full html.parser parse (the reference), plus the time each mode took.
+    Run it on a sample of saved pages before switching backends.
+    """
+    backends = [HTML_PARSER_STDLIB] + ([LXML] if lxml is not None else [])
+    modes = [(backend, content_only) for backend in backends for content_only in (False, True)]
+    label = lambda mode: mode[0] + (" content-only" if mode[1] else "")
+    seconds = {label(mode): 0.0 for mode in modes}
+    mismatches = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        outputs = {}
+        for mode in modes:
+            started = time.perf_counter()
+            outputs[mode] = parse_html_to_json(html, job_config, *mode)
+            seconds[label(mode)] += time.perf_counter() - started
+        for mode in modes[1:]:
+            if outputs[mode] != outputs[modes[0]]:
+                mismatches.append({"file": path, "backend": label(mode)})
+    return {"files": len(paths), "seconds": seconds, "mismatches": mismatches}
+
+
+if __name__ == "__main__":
+    # python -m scrapers.html_to_json page.html [--backend lxml]
+    # python -m scrapers.html_to_json --compare data/*/WI/*/*/htmldata/*.html
+    parser = argparse.ArgumentParser(description="Parse saved WCCA case pages to JSON")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--backend", default=HTML_PARSER, help="auto, lxml or html.parser")
+    parser.add_argument("--full-page", action="store_true", help="Build the whole page tree, not just the content column")
+    parser.add_argument("--compare", action="store_true", help="Check every backend gives the same output and time them")
+    args = parser.parse_args()
+
+    if args.compare:
+        report = compare_backends(args.paths)
+        for backend, spent in report["seconds"].items():
+            log.info(f"⏱ {backend}: {spent:.2f}s for {report['files']} files ({spent / max(report['files'], 1) * 1000:.1f} ms/file)")
+        for mismatch in report["mismatches"]:
+            log.warning(f"⚠ {mismatch['backend']} output differs from html.parser: {mismatch['file']}")
+        if not report["mismatches"]:
+            log.info("✅ All backends and modes produce identical output")
+        sys.exit(1 if report["mismatches"] else 0)
+
+    for path in args.paths:
+        print(json.dumps(parse_html_file_to_json(path, backend=args.backend, content_only=not args.full_page), indent=2))
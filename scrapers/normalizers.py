@@ -0,0 +1,231 @@
+# scrapers/normalizers.py
+import re
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Dict
+
+from config import NORMALIZER_CACHE_SIZE
+
+# Patterns compiled once at import instead of on every call
+MONEY_RE = re.compile(r"-?\$?([\d,]+(?:\.\d+)?)")
+MM_DD_YYYY_RE = re.compile(r"(\d{1,2})-(\d{1,2})-(\d{4})")
+MM_YYYY_RE = re.compile(r"(\d{1,2})-(\d{4})$")
+CITY_STATE_ZIP_RE = re.compile(r"(.*)\b([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\s*$")
+STATE_TOKEN_RE = re.compile(r"^[A-Za-z]{2}$")
+ZIP_TOKEN_RE = re.compile(r"^\d{5}(?:-\d{4})?$")
+ADDRESS_TAIL_RE = re.compile(r"(.*?),?\s*([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\s*$")
+STATE_ZIP_RE = re.compile(r"([A-Za-z]{2})\s*(\d{5}(?:-\d{4})?)?")
+
+EMPTY_ADDRESS = (None, None, None, None)
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _money(text: str) -> Optional[float]:
+    # remove commas, dollar signs
+    m = MONEY_RE.search(text)
+    if not m:
+        return None
+    try:
+        return float(m.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def parse_money(text: str) -> Optional[float]:
+    """'$1,234.50' -> 1234.5; None when there is no amount."""
+    if not text:
+        return None
+    return _money(text)
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _iso_date(text: str) -> Optional[str]:
+    text = text.strip()
+    # try mm-dd-yyyy
+    m = MM_DD_YYYY_RE.match(text)
+    if m:
+        mm, dd, yyyy = m.groups()
+        try:
+            d = datetime(int(yyyy), int(mm), int(dd))
+            return d.strftime("%Y-%m-%d")
+        except ValueError:
+            return f"{yyyy}-{mm.zfill(2)}-{dd.zfill(2)}"
+    # try mm-yyyy (DOB style)
+    m2 = MM_YYYY_RE.match(text)
+    if m2:
+        mm, yyyy = m2.groups()
+        return f"{mm.zfill(2)}-{yyyy}"  # keep as '05-1989' style
+    # fallback: try parse yyyy-mm-dd-like
+    try:
+        d = datetime.fromisoformat(text.split()[0])
+        return d.date().isoformat()
+    except (ValueError, IndexError):
+        return None
+
+
+def iso_date_from_mm_dd_yyyy(text: str) -> Optional[str]:
+    """
+    Converts '11-25-2025' or '11-25-2025 08:15 am' to '2025-11-25'.
+    If text looks like '11-25-2025' returns '2025-11-25'.
+    If text is '05-1989' returns '05-1989' (leave DOB monthly-year format).
+    """
+    if not text:
+        return None
+    return _iso_date(text)
+
+
+def _none_if_empty(x: Optional[str]) -> Optional[str]:
+    if x is None:
+        return None
+    x = x.strip()
+    return x if x != "" else None
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _address(addr: str) -> tuple:
+    addr = addr.strip()
+    # Normalize multiple spaces
+    addr = " ".join(addr.split())
+
+    # If there are 3+ comma-separated parts, assume: line1, city, state_zip (extra commas in street handled by joining)
+    parts = [p.strip() for p in addr.split(",")]
+    if len(parts) >= 3:
+        line1 = parts[0]
+        # join middle parts except last as city (handles "City, Extra" edgecases)
+        city = ", ".join(parts[1:-1]).strip()
+        state_zip = parts[-1]
+    elif len(parts) == 2:
+        # Parts: [line1, city + state_zip] OR [line1, city state zip]
+        line1 = parts[0]
+        state_zip = parts[1]
+        # Try to split state_zip into city/state/zip by regex: look for last ' STATE ZIP' pattern
+        # If it doesn't match, treat everything before last two tokens as city.
+        m = CITY_STATE_ZIP_RE.search(state_zip)
+        if m:
+            city = m.group(1).strip()
+            state_zip = f"{m.group(2)} {m.group(3)}"
+        else:
+            # fallback: try to split the state_zip by whitespace, assume last two tokens state+zip or last token state
+            toks = state_zip.split()
+            if len(toks) >= 2 and STATE_TOKEN_RE.match(toks[-2]) and ZIP_TOKEN_RE.match(toks[-1]):
+                city = " ".join(toks[:-2])
+                state_zip = f"{toks[-2]} {toks[-1]}"
+            else:
+                # can't reliably split, assume everything is city
+                city = state_zip
+                state_zip = ""
+    else:
+        # No comma at all — try to parse from the end using regex
+        line1 = None
+        city = None
+        state_zip = addr
+        m = ADDRESS_TAIL_RE.search(addr)
+        if m:
+            line1 = m.group(1).strip()
+            # fallback: treat line1 as combined and then split
+            parts2 = line1.split(",")
+            if len(parts2) >= 2:
+                line1 = parts2[0].strip()
+                city = parts2[1].strip()
+            else:
+                # unknown: set line1 as first chunk
+                line1 = parts2[0].strip()
+            state_zip = f"{m.group(2)} {m.group(3)}"
+
+    # Now parse state_zip for state and zip
+    state = None
+    zipc = None
+    if state_zip:
+        m2 = STATE_ZIP_RE.search(state_zip)
+        if m2:
+            state = m2.group(1)
+            zipc = m2.group(2) if m2.group(2) else None
+
+    return (_none_if_empty(line1), _none_if_empty(city), _none_if_empty(state), _none_if_empty(zipc))
+
+
+def parse_address(addr: str) -> Dict[str, Optional[str]]:
+    """
+    Parse an address string like:
+      - "18410 South St Apt 12, Whitehall, WI 54773"
+      - "5367 Eagle St, White Bear Lake, MN 55110"
+      - "123 Main St, Smalltown WI 12345" (no comma before state)
+    Returns dict with keys: line1, city, state, zip (a new dict on every
+    call, so callers may modify it; the cache only holds the parsed tuple)
+    """
+    line1, city, state, zipc = _address(addr) if addr else EMPTY_ADDRESS
+    return {"line1": line1, "city": city, "state": state, "zip": zipc}
+
+
+CACHED = {"money": _money, "date": _iso_date, "address": _address}
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Hits, misses and hit rate of each normalizer cache since start (or clear_caches())."""
+    stats = {}
+    for name, func in CACHED.items():
+        info = func.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "hit_rate": round(info.hits / calls, 3) if calls else 0.0
+        }
+    return stats
+
+
+def clear_caches():
+    for func in CACHED.values():
+        func.cache_clear()
+
+
+def _bench(rows: int, distinct: int, repeat: int):
+    """
+    Time the normalizers over a synthetic court_records-like workload (a
+    date, an amount and an address per row, drawn from `distinct` values
+    each, as dockets of one county repeat them) with and without caching.
+    """
+    rng = random.Random(7)
+    dates = [f"{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}-20{rng.randint(15, 25)}" for _ in range(distinct)]
+    amounts = [f"${rng.randint(1, 500000) / 100:,.2f}" for _ in range(distinct)]
+    cities = ["Whitehall, WI 54773", "White Bear Lake, MN 55110", "Smalltown WI 12345", "Alma, WI 54610-1234"]
+    addresses = [f"{rng.randint(1, 99999)} Main St, {rng.choice(cities)}" for _ in range(distinct)]
+    workload = [(rng.choice(dates), rng.choice(amounts), rng.choice(addresses)) for _ in range(rows)]
+
+    def run(money, date, address):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for d, a, addr in workload:
+                date(d)
+                money(a)
+                address(addr)
+        return time.perf_counter() - started
+
+    uncached = run(_money.__wrapped__, _iso_date.__wrapped__, _address.__wrapped__)
+    clear_caches()
+    cached = run(parse_money, iso_date_from_mm_dd_yyyy, parse_address)
+    per_row = 1e6 / (rows * repeat)
+    print(f"{rows} rows x {repeat}, {distinct} distinct values per field")
+    print(f"  uncached: {uncached:.3f}s ({uncached * per_row:.2f} us/row)")
+    print(f"  cached:   {cached:.3f}s ({cached * per_row:.2f} us/row) -> {uncached / cached:.1f}x faster")
+    for name, entry in cache_stats().items():
+        print(f"  {name}: hit rate {entry['hit_rate']:.1%} ({entry['size']} cached)")
+
+
+if __name__ == "__main__":
+    # python -m scrapers.normalizers --bench --rows 100000 --distinct 2000
+    parser = argparse.ArgumentParser(description="Normalizer micro-benchmark")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--distinct", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        sys.exit(0)
+    _bench(args.rows, args.distinct, args.repeat)
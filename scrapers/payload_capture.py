@@ -0,0 +1,58 @@
+# scrapers/payload_capture.py
+
+import re
+import asyncio
+from urllib.parse import urlparse
+
+from config import CASE_PAYLOAD_URL_PATTERNS
+from utils.logger import log
+
+
+class CasePayloadCapture:
+    """
+    Listens to a page's network responses and keeps the JSON bodies the WCCA
+    front end loads to render a case.
+
+    Usage:
+        capture = CasePayloadCapture(page)
+        capture.start()
+        ... navigate ...
+        payload = await capture.stop()   # {url_path: parsed_json} or None
+    """
+
+    def __init__(self, page, url_patterns=CASE_PAYLOAD_URL_PATTERNS):
+        self.page = page
+        self.url_patterns = [re.compile(p, re.I) for p in url_patterns]
+        self.payload = {}
+        self._pending = []
+
+    def _wanted(self, response) -> bool:
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        if "json" not in response.headers.get("content-type", ""):
+            return False
+        return any(p.search(response.url) for p in self.url_patterns)
+
+    def _on_response(self, response):
+        if self._wanted(response):
+            self._pending.append(asyncio.ensure_future(self._read(response)))
+
+    async def _read(self, response):
+        try:
+            body = await response.json()
+        except Exception as e:
+            log.warning(f"Could not read case payload from {response.url}: {e}")
+            return
+        self.payload[urlparse(response.url).path] = body
+
+    def start(self):
+        self.page.on("response", self._on_response)
+
+    async def stop(self, timeout: float = 5):
+        """Detach from the page and wait for bodies still being read."""
+        self.page.remove_listener("response", self._on_response)
+        if self._pending:
+            _, still_reading = await asyncio.wait(self._pending, timeout=timeout)
+            for task in still_reading:
+                task.cancel()
+        return self.payload or None
@@ -0,0 +1,147 @@
+# scrapers/wcca_http_fetcher.py
+
+import time
+from urllib.parse import urlparse, parse_qs
+
+import aiohttp
+
+from config import HTTP_FETCH_TIMEOUT, HTTP_USER_AGENT, WCCA_CASE_DATA_URL, HTTP_MAX_JS_ESCALATIONS
+from utils.logger import log
+
+UNAVAILABLE_SNIPPET = "your request could not be processed."
+CAPTCHA_MARKERS = ("please complete the captcha", "hcaptcha", "geetest")
+CASE_SUMMARY_MARKER = "case summary"
+
+
+def classify_case_html(html: str) -> str:
+    """
+    Classify a case detail response without rendering it.
+
+    Returns:
+      "ok"          -> server-rendered case page with a Case Summary
+      "unavailable" -> WCCA "request could not be processed" page
+      "captcha"     -> captcha interstitial; needs the browser
+      "js"          -> shell page whose content is built by JavaScript; needs the browser
+    """
+    if not html:
+        return "js"
+    lower = html.lower()
+    # Same precedence as the browser path: unavailable, then Case Summary, then captcha
+    if UNAVAILABLE_SNIPPET in lower:
+        return "unavailable"
+    if CASE_SUMMARY_MARKER in lower:
+        return "ok"
+    if any(marker in lower for marker in CAPTCHA_MARKERS):
+        return "captcha"
+    return "js"
+
+
+class WccaHttpFetcher:
+    """
+    Plain HTTP fetch path for case detail pages.
+
+    Reuses the session cookies held in the run's CookieStore, so a
+    docket costs one HTTP round trip instead of a full render. Anything that
+    needs the browser (captcha, JavaScript-only content, network errors) is
+    reported back so the scraper can escalate to Playwright. After
+    max_js_escalations JavaScript-only pages in a row, the fetcher turns
+    itself off for the rest of the run.
+    """
+
+    def __init__(self, cookie_store, timeout: float = HTTP_FETCH_TIMEOUT,
+                 data_url: str = WCCA_CASE_DATA_URL, max_js_escalations: int = HTTP_MAX_JS_ESCALATIONS):
+        self.cookie_store = cookie_store
+        self.timeout = timeout
+        self.data_url = data_url
+        self.max_js_escalations = max_js_escalations
+
+        self.session = None
+        self.enabled = True
+        self._cookie_header = ""
+        self._cookie_version = None
+        self._js_streak = 0
+        self.stats = {"ok": 0, "unavailable": 0, "captcha": 0, "js": 0, "error": 0}
+
+    async def start(self):
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": HTTP_USER_AGENT, "Accept": "text/html,application/json;q=0.9,*/*;q=0.8"}
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _load_cookies(self, host: str):
+        """Rebuild the Cookie header whenever the cookie store changes."""
+        if self.cookie_store.version == self._cookie_version:
+            return
+
+        now = time.time()
+        pairs = []
+        for cookie in self.cookie_store.get():
+            domain = cookie.get("domain", "").lstrip(".")
+            expires = cookie.get("expires", -1)
+            if domain and not host.endswith(domain):
+                continue
+            if expires not in (-1, None) and expires < now:
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+
+        self._cookie_header = "; ".join(pairs)
+        self._cookie_version = self.cookie_store.version
+
+    def _build_data_url(self, case_url: str):
+        if not self.data_url:
+            return None
+        query = parse_qs(urlparse(case_url).query)
+        case_no = query.get("caseNo", [""])[0]
+        county_no = query.get("countyNo", [""])[0]
+        return self.data_url.format(caseNo=case_no, countyNo=county_no)
+
+    async def fetch_case(self, case_url: str) -> dict:
+        """
+        Fetch one case detail page.
+
+        Returns {"status": ok|unavailable|captcha|js|error, "html": str, "payload": dict|None}.
+        """
+        if self.session is None:
+            await self.start()
+
+        self._load_cookies(urlparse(case_url).hostname or "")
+        headers = {"Cookie": self._cookie_header} if self._cookie_header else {}
+
+        try:
+            async with self.session.get(case_url, headers=headers) as response:
+                html = await response.text()
+                http_status = response.status
+        except Exception as e:
+            log.warning(f"HTTP fetch failed: {e}")
+            self.stats["error"] += 1
+            return {"status": "error", "html": "", "payload": None}
+
+        status = classify_case_html(html)
+        if http_status in (403, 429) and status != "unavailable":
+            status = "captcha"
+
+        payload = None
+        data_url = self._build_data_url(case_url)
+        if status == "ok" and data_url:
+            try:
+                async with self.session.get(data_url, headers=headers) as response:
+                    if response.status == 200:
+                        payload = await response.json(content_type=None)
+            except Exception as e:
+                log.warning(f"Case data call failed: {e}")
+
+        if status == "js":
+            self._js_streak += 1
+            if self.enabled and self._js_streak >= self.max_js_escalations:
+                self.enabled = False
+                log.warning(f"⚠ {self._js_streak} JavaScript-only pages in a row - disabling HTTP fetch for this run.")
+        else:
+            self._js_streak = 0
+
+        self.stats[status] += 1
+        return {"status": status, "html": html, "payload": payload}
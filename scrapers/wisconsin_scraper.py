@@ -1,12 +1,16 @@
 import os
 import json
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import time
+import asyncio
 
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.payload_capture import CasePayloadCapture
 #from utils.captcha_solver import solve_puzzle_captcha
 from utils.browser_manager import get_browser
+from utils.page_state import wait_for_page_state, STATE_SUMMARY, STATE_UNAVAILABLE, STATE_CAPTCHA, STATE_ERROR, STATE_TIMEOUT
 from utils.logger import log
+from config import CAPTURE_MODE
 
 COOKIE_FILE = "wcca_cookies.json"
 
@@ -27,6 +31,47 @@ def html_indicates_unavailable(html: str) -> bool:
 
 class WisconsinScraper(BaseScraper):
 
+    def __init__(self, config: dict, browser_pool=None, http_fetcher=None, cookie_store=None, rate_limiter=None):
+        super().__init__(config)
+        # Shared BrowserPool owned by main(); None launches a browser per docket
+        self.browser_pool = browser_pool
+        # Optional WccaHttpFetcher tried before the browser
+        self.http_fetcher = http_fetcher
+        # In-memory CookieStore for the run; None reads/writes COOKIE_FILE directly
+        self.cookie_store = cookie_store
+        # HostRateLimiter shared by all jobs of the worker; None sends requests unthrottled
+        self.rate_limiter = rate_limiter
+        # Request interception counters for this docket (pooled pages only)
+        self.resource_stats = None
+        # Set when a captcha page was shown for this docket (drives per-session captcha budgets)
+        self.captcha_seen = False
+        # JSON case data captured from the page's XHRs (CAPTURE_MODE payload/both)
+        self.payload_capture = None
+        self.payload = None
+        # Seconds from request to first page state, and whether the page never settled
+        # (signals for the adaptive rate controller)
+        self.latency = None
+        self.timed_out = False
+
+    async def _open_page(self):
+        """Borrow a page from the pool, or launch a one-off browser."""
+        if self.browser_pool is not None:
+            page = await self.browser_pool.acquire()
+            return None, self.browser_pool.context, page
+        return await get_browser()
+
+    async def _close_page(self, playwright, context, page, healthy=True):
+        """Return a pooled page, or tear down the one-off browser."""
+        if self.payload_capture is not None:
+            self.payload = await self.payload_capture.stop()
+            self.payload_capture = None
+        if self.browser_pool is not None:
+            self.resource_stats = self.browser_pool.take_resource_stats(page)
+            await self.browser_pool.release(page, healthy=healthy)
+            return
+        await context.close()
+        await playwright.stop()
+
     # async def get_geetest_params(self, page):
     #     """
     #     Extract dynamic gt and challenge parameters from the page.
@@ -66,22 +111,23 @@ class WisconsinScraper(BaseScraper):
         log.info("🔍 Checking for CAPTCHA screen...")
 
         # Detect 'Please complete the CAPTCHA'
-        try:
-            await page.wait_for_selector("text=Please complete the CAPTCHA", timeout=4000)
-            log.warning("⚠ CAPTCHA page detected.")
-        except Exception:
+        if await wait_for_page_state(page, timeout=4000) != STATE_CAPTCHA:
             log.info("✅ No CAPTCHA text detected.")
             return False
+        log.warning("⚠ CAPTCHA page detected.")
 
         # Click "Click here" to reveal puzzle
         try:
             await page.click("text=Click here", timeout=30000)
             log.info("🖱 Clicked 'Click here' to reveal CAPTCHA.")
-            await page.wait_for_timeout(30000)
         except Exception as e:
             log.error(f"❌ Failed to click 'Click here': {e}")
             return None
 
+        # Give the puzzle up to 30s, but resume the moment the page moves past the captcha
+        state = await wait_for_page_state(page, timeout=30000, exclude=(STATE_CAPTCHA,))
+        log.info(f"⌛ Page state after CAPTCHA: {state}")
+
         # Extract Geetest params
         # gt, challenge = await self.get_geetest_params(page)
         # if not gt or not challenge:
@@ -131,10 +177,76 @@ class WisconsinScraper(BaseScraper):
 
         return True
 
+    async def _try_http_fetch(self, case_url: str, docket: str):
+        """
+        Fetch the case over plain HTTP with the saved session cookies.
+        Returns a result dict, or None when the browser has to take over.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.wait(case_url)
+        started = time.monotonic()
+        result = await self.http_fetcher.fetch_case(case_url)
+        self.latency = time.monotonic() - started
+        status = result["status"]
+
+        if status in ("ok", "unavailable"):
+            log.info(f"⚡ HTTP fetch for {docket}: {status}")
+            # Over HTTP "unavailable" always means the WCCA notice was in the response
+            return {"docket": docket, "html": result["html"], "status": status, "engine": "http",
+                    "payload": result.get("payload"), "latency": self.latency,
+                    "unavailable_confirmed": status == "unavailable"}
+
+        log.info(f"↪ HTTP fetch for {docket} returned '{status}' - escalating to browser.")
+        return None
+
     async def run_scraper(self):
         """Run the scraper for the current JOB_CONFIG."""
-        playwright,context, page = await get_browser()
+        if self.http_fetcher is not None and self.http_fetcher.enabled:
+            docket = f"{self.config['docketYear']}{self.config['docketType']}{self.config['docketNumber']}"
+            results = await self._try_http_fetch(self.config.get("case_url"), docket)
+            if results is not None:
+                return results
 
+        playwright = context = page = None
+        try:
+            playwright, context, page = await self._open_page()
+            if CAPTURE_MODE != "html":
+                self.payload_capture = CasePayloadCapture(page)
+                self.payload_capture.start()
+            results = await self._scrape(playwright, context, page)
+            if results is not None and self.captcha_seen:
+                results["captcha_seen"] = True
+            if results is not None and self.latency is not None:
+                results["latency"] = self.latency
+            if results is not None and self.timed_out:
+                results["timed_out"] = True
+            if results is not None and self.payload:
+                results["payload"] = self.payload
+            if results is not None and self.resource_stats:
+                stats = self.resource_stats
+                results["resource_stats"] = stats
+                log.info(
+                    f"🧹 Blocked {stats['blocked_requests']} requests "
+                    f"(~{stats['estimated_bytes_saved'] // 1024} KB saved), "
+                    f"loaded {stats['bytes_loaded'] // 1024} KB"
+                )
+            return results
+        except asyncio.CancelledError:
+            # Look-ahead scrape no longer needed; don't hand a half-loaded page back as healthy
+            if page is not None:
+                await self._close_page(playwright, context, page, healthy=False)
+            raise
+        except Exception as e:
+            # Page or browser died mid-scrape; recycle it and report a network-style failure
+            log.error(f"Scrape aborted by unexpected error: {e}")
+            if page is not None:
+                try:
+                    await self._close_page(playwright, context, page, healthy=False)
+                except Exception:
+                    pass
+            return None
+
+    async def _scrape(self, playwright, context, page):
         # Get the pre-built URL from config
         case_url = self.config.get("case_url")
         docket = f"{self.config['docketYear']}{self.config['docketType']}{self.config['docketNumber']}"
@@ -142,7 +254,16 @@ class WisconsinScraper(BaseScraper):
         log.info(f"--- Starting scrape for {docket} ---")
 
         # --- STEP 1: LOAD COOKIES ---
-        if os.path.exists(COOKIE_FILE):
+        if self.cookie_store is not None:
+            # Pooled contexts keep their cookies; only push them when the store has newer ones
+            pool = self.browser_pool
+            if pool is None or pool.cookie_version != self.cookie_store.version:
+                cookies = self.cookie_store.get()
+                if cookies:
+                    await context.add_cookies(cookies)
+                if pool is not None:
+                    pool.cookie_version = self.cookie_store.version
+        elif os.path.exists(COOKIE_FILE):
             try:
                 with open(COOKIE_FILE, "r", encoding="utf-8") as f:
                     cookies = json.load(f)
@@ -152,103 +273,75 @@ class WisconsinScraper(BaseScraper):
                 log.error(f"Failed loading cookies: {e}")
 
         # --- STEP 2: NAVIGATE ---
+        if self.rate_limiter is not None:
+            await self.rate_limiter.wait(case_url)
+        started = time.monotonic()
         try:
             await page.goto(case_url, wait_until="domcontentloaded", timeout=60000)
         except Exception as e:
             log.error(f"Navigation failed: {e}")
-            await context.close()
-            await playwright.stop()
+            await self._close_page(playwright, context, page, healthy=False)
             return None
 
-        # --- STEP 3: HANDLE CAPTCHA ---
+        # --- STEP 3: WAIT FOR THE PAGE TO SETTLE, HANDLE CAPTCHA ---
+        state = await wait_for_page_state(page, timeout=15000)
+        self.latency = time.monotonic() - started
+        self.timed_out = state == STATE_TIMEOUT
+
         max_retries = 3
         for attempt in range(max_retries):
-            # If already inside, stop trying
-            if await page.query_selector("text=Case Summary"):
-                # log.info("✅ Case Summary already visible; no CAPTCHA.")
+            if state != STATE_CAPTCHA:
                 break
 
-            result = await self.detect_and_solve_captcha(page)
+            self.captcha_seen = True
 
-            if result is True:
-                # Solved automatically
-                log.info("⌛ Waiting for page after CAPTCHA auto-solve...")
-                await page.wait_for_timeout(3000)
-
-            # elif result == "manual":
-            #     # User will solve Geetest manually in the browser.
-            #     log.warning(
-            #         "🧑‍💻 Manual CAPTCHA mode: solve the puzzle in the browser window. "
-            #         "Waiting for the CAPTCHA message to disappear or Case Summary to load..."
-            #     )
-
-            #     try:
-            #         # Wait until either CAPTCHA text is gone OR Case Summary is visible.
-            #         await page.wait_for_function(
-            #             "() => !document.body.innerText.includes('Please complete the CAPTCHA') "
-            #             "|| document.body.innerText.includes('Case Summary')",
-            #             timeout=10000  # e.g. up to 5 minutes; adjust as you like
-            #         )
-            #         log.info("✅ Manual CAPTCHA solve detected.")
-            #     except PlaywrightTimeoutError:
-            #         log.error("❌ Manual CAPTCHA not solved within allowed time.")
-            #         await context.close()
-            #         await playwright.stop()
-            #         return None
-
-            #     # Small delay after success, then continue to STEP 4
-            #     await page.wait_for_timeout(2000)
-            #     break
-
-
-            # elif result is False:
-            #     # No CAPTCHA present
-            #     log.info(" No CAPTCHA detected, continuing.")
-            #     break
-            # else:
-            #     # result is None → fatal error; abort this docket
-            #     log.error("❌ CAPTCHA solving failed fatally; aborting this docket.")
-            #     await context.close()
-            #     await playwright.stop()
-            #     return None
+            result = await self.detect_and_solve_captcha(page)
+            if result is not True:
+                break
+            state = await wait_for_page_state(page, timeout=15000)
 
         # --- STEP 4: GET HTML AND CHECK STATUS ---
         html = await page.content()
         
         # FIRST: Check if this is an "unavailable case" (case doesn't exist)
-        if html_indicates_unavailable(html):
+        if state == STATE_UNAVAILABLE or html_indicates_unavailable(html):
             log.info("ℹ️ Case does not exist - legitimate unavailable case.")
-            await context.close()
-            await playwright.stop()
-            return {"docket": docket, "html": html, "status": "unavailable"}
+            await self._close_page(playwright, context, page)
+            return {"docket": docket, "html": html, "status": "unavailable", "unavailable_confirmed": True}
         
         # SECOND: Check if Case Summary is present (successful scrape)
-        try:
-            await page.wait_for_selector("text=Case Summary", timeout=15000)
+        if state == STATE_SUMMARY:
             log.info("✅ Case Summary Loaded.")
 
             # Save the valid session so next time we may skip CAPTCHA
             cookies = await context.cookies()
-            with open(COOKIE_FILE, "w", encoding="utf-8") as f:
-                json.dump(cookies, f, indent=2)
-            log.info("💾 Session cookies saved for future use.")
+            if self.cookie_store is not None:
+                # Written to disk by the store's write-behind flush
+                if self.cookie_store.update(cookies) and self.browser_pool is not None:
+                    self.browser_pool.cookie_version = self.cookie_store.version
+            else:
+                with open(COOKIE_FILE, "w", encoding="utf-8") as f:
+                    json.dump(cookies, f, indent=2)
+                log.info("💾 Session cookies saved for future use.")
             
-            await context.close()
-            await playwright.stop()
+            await self._close_page(playwright, context, page)
             return {"docket": docket, "html": html, "status": "ok"}
 
-        except PlaywrightTimeoutError:
-            # THIRD: Check if CAPTCHA is present (real CAPTCHA failure)
-            has_captcha_text = "Please complete the CAPTCHA" in html or "hCaptcha" in html
-            
-            if has_captcha_text:
-                log.error("❌ CAPTCHA detected but not solved.")
-                await context.close()
-                await playwright.stop()
-                return {"docket": docket, "html": html, "status": "failed"}
-            else:
-                # Unknown state - treat as unavailable to be safe
-                log.warning("⚠️ Could not find Case Summary and no CAPTCHA detected - treating as unavailable.")
-                await context.close()
-                await playwright.stop()
-                return {"docket": docket, "html": html, "status": "unavailable"}
\ No newline at end of file
+        # THIRD: Server error page - retry like a network failure instead of skipping
+        if state == STATE_ERROR:
+            log.error("❌ WCCA returned an error page.")
+            await self._close_page(playwright, context, page)
+            return None
+
+        # FOURTH: Check if CAPTCHA is present (real CAPTCHA failure)
+        has_captcha_text = state == STATE_CAPTCHA or "Please complete the CAPTCHA" in html or "hCaptcha" in html
+        
+        if has_captcha_text:
+            log.error("❌ CAPTCHA detected but not solved.")
+            await self._close_page(playwright, context, page)
+            return {"docket": docket, "html": html, "status": "failed"}
+        else:
+            # Unknown state - treat as unavailable to be safe
+            log.warning("⚠️ Could not find Case Summary and no CAPTCHA detected - treating as unavailable.")
+            await self._close_page(playwright, context, page)
+            return {"docket": docket, "html": html, "status": "unavailable"}
\ No newline at end of file
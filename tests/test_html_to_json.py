@@ -0,0 +1,69 @@
+import os
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapers.html_to_json import (
+    parse_html_to_json, parse_html_file_to_json, resolve_backend, CONTENT_COLUMN_STRAINER, BACKENDS
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "wcca")
+
+# Output of the original scrapers/html_to_json.py (before the backend, tree-walk and
+# content-column changes) for every fixture page
+with open(os.path.join(FIXTURE_DIR, "expected.json"), "r", encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+PAGES = sorted(EXPECTED)
+CONTENT_PAGES = [name for name in PAGES if EXPECTED[name].get("caption")]
+
+
+def job_config_for(name: str) -> dict:
+    state, county_no, docket_year, docket_type, docket_number = name[:-len(".html")].split("_")
+    return {
+        "stateAbbreviation": state,
+        "countyNo": int(county_no),
+        "docketYear": int(docket_year),
+        "docketType": docket_type,
+        "docketNumber": docket_number
+    }
+
+
+def read_page(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def as_json(result: dict):
+    """The result as it is uploaded / written, so tuples and lists compare alike."""
+    return json.loads(json.dumps(result))
+
+
+@pytest.mark.parametrize("content_only", [False, True], ids=["full-page", "content-only"])
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", PAGES)
+def test_output_matches_original_parser(name, backend, content_only):
+    result = parse_html_to_json(read_page(name), job_config_for(name), backend, content_only)
+    assert as_json(result) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", PAGES)
+def test_bytes_and_file_input_match_original_parser(name, backend):
+    html = read_page(name)
+    assert as_json(parse_html_to_json(html.encode("utf-8"), job_config_for(name), backend)) == EXPECTED[name]
+    path = os.path.join(FIXTURE_DIR, name)
+    assert as_json(parse_html_file_to_json(path, job_config_for(name), backend)) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", CONTENT_PAGES)
+def test_content_column_strainer_keeps_only_the_content_column(name, backend):
+    # Includes a page whose content column carries a second class
+    soup = BeautifulSoup(read_page(name), resolve_backend(backend), parse_only=CONTENT_COLUMN_STRAINER)
+    content_col = soup.find("div", class_="content-column")
+    assert content_col is not None
+    assert soup.find("nav") is None
+    assert soup.find("script") is None
+    assert content_col.find("span", class_="caption").get_text(strip=True) == EXPECTED[name]["caption"]
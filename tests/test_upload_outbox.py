@@ -0,0 +1,127 @@
+import asyncio
+
+import main
+from config import INSERT_BATCH_PATH
+from utils.unavailable_cache import UnavailableDocketCache
+from utils.upload_outbox import UploadOutbox
+
+EXISTING = set(range(1, 21)) - {7}
+SKIP_COUNT = 5
+
+COURT_DETAILS = {
+    "recordId": 1,
+    "InitialURL": "https://wcca.wicourts.gov",
+    "urlFormat": "https://wcca.wicourts.gov/caseDetail.html?caseNo={year}TR{seqNo}&countyNo=6",
+    "consecutiveSkipCount": SKIP_COUNT,
+    "countyNo": 6,
+    "countyName": "Buffalo County",
+    "docketYear": 2025,
+    "docketNumber": 0,
+    "docketType": "TR"
+}
+
+
+class FakeApi:
+    """Async API client that records what was inserted and how far each job was moved."""
+
+    def __init__(self, fail_inserts: bool = False):
+        self.fail_inserts = fail_inserts
+        self.inserted = []
+        self.updates = []
+
+    async def post(self, path, data):
+        if path == INSERT_BATCH_PATH:
+            if self.fail_inserts:
+                raise ConnectionError("API down")
+            self.inserted.extend(item["seqNo"] for item in (data if isinstance(data, list) else [data]))
+        elif path == "/WI_County_DocketNumber_UPDATE":
+            self.updates.append(data["docketNumber"])
+        return {"success": True}
+
+
+def insert_payload(seq_no: int) -> dict:
+    return {
+        "agencyID": 6,
+        "agencyName": "Buffalo County",
+        "datasetID": "WI-901-TR",
+        "year": 2025,
+        "seqNo": seq_no,
+        "htmlContent": "<html>Case Summary</html>",
+        "docketType": "TR",
+        "emailID": ""
+    }
+
+
+def crash_after_outbox_write(path: str, scraped: list, confirmed: list):
+    """The state a worker leaves behind when it dies with uploads still in flight."""
+    outbox = UploadOutbox(path)
+    for seq_no in scraped:
+        outbox_id = outbox.append(INSERT_BATCH_PATH, seq_no, insert_payload(seq_no))
+        if seq_no in confirmed:
+            outbox.ack(outbox_id)
+    outbox.conn.close()  # no compact()/close(): the process is gone
+
+
+async def restart_and_run(outbox_path: str, tmp_path, replay_api: FakeApi, api: FakeApi, monkeypatch) -> list:
+    """Start a worker on the old outbox, replay it, then run the job from its old docket number."""
+    scraped = []
+
+    async def fake_scrape(session_pool, docket_config, rate_limiter=None, rate_controller=None):
+        number = int(docket_config["docketNumber"])
+        scraped.append(number)
+        if number in EXISTING:
+            return {"docket": docket_config["docketNumber"], "html": "<html>Case Summary</html>", "status": "ok"}
+        return {"docket": docket_config["docketNumber"], "html": "", "status": "unavailable",
+                "unavailable_confirmed": True}
+
+    monkeypatch.setattr(main, "scrape_on_session", fake_scrape)
+    monkeypatch.chdir(tmp_path)
+
+    outbox = UploadOutbox(outbox_path)
+    cache = UnavailableDocketCache(str(tmp_path / "unavailable.sqlite3"))
+    try:
+        await outbox.replay(replay_api)
+        runtime = {
+            "async_api_client": api,
+            "session_pool": None,
+            "unavailable_cache": cache,
+            "upload_outbox": outbox,
+            "prefetch_wanted": asyncio.Event(),
+            "finalizers": set()
+        }
+        job = main.prepare_job(dict(COURT_DETAILS), None)
+        outcome = await main.run_job(job, runtime)
+        await main.drain_finalizers(runtime)
+        assert not outcome["scraper_error"]
+        assert outbox.pending() == 0
+    finally:
+        outbox.close()
+        cache.close()
+    return scraped
+
+
+def test_replayed_dockets_are_not_scraped_or_inserted_again(tmp_path, monkeypatch):
+    outbox_path = str(tmp_path / "outbox.sqlite3")
+    crash_after_outbox_write(outbox_path, scraped=[1, 2, 3, 4, 5, 6, 8], confirmed=[8])
+
+    api = FakeApi()
+    scraped = asyncio.run(restart_and_run(outbox_path, tmp_path, api, api, monkeypatch))
+
+    assert not {1, 2, 3, 4, 5, 6, 8} & set(scraped)
+    assert sorted(api.inserted) == sorted(EXISTING - {8})
+    assert len(api.inserted) == len(set(api.inserted))
+    assert api.updates == [20]
+
+
+def test_dockets_left_in_outbox_are_uploaded_without_scraping(tmp_path, monkeypatch):
+    outbox_path = str(tmp_path / "outbox.sqlite3")
+    crash_after_outbox_write(outbox_path, scraped=[1, 2, 3], confirmed=[])
+
+    # The API is still down at startup, so the replay leaves everything in the outbox
+    api = FakeApi()
+    scraped = asyncio.run(restart_and_run(outbox_path, tmp_path, FakeApi(fail_inserts=True), api, monkeypatch))
+
+    assert not {1, 2, 3} & set(scraped)
+    assert sorted(api.inserted) == sorted(EXISTING)
+    assert len(api.inserted) == len(set(api.inserted))
+    assert api.updates == [20]
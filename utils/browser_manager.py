@@ -4,23 +4,196 @@ from playwright_stealth import Stealth
 
 from playwright.async_api import async_playwright
 
+from config import BROWSER_PROFILE_DIR, BROWSER_HEADLESS, BROWSER_POOL_SIZE, BROWSER_PAGE_MAX_USES, RESOURCE_BLOCKING
+from utils.logger import log
+from utils.resource_filter import ResourceFilter
+
+BROWSER_ARGS = [
+    "--start-maximized",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars"
+]
+
 async def get_browser():
     playwright = await async_playwright().start()
 
     context = await playwright.chromium.launch_persistent_context(
-        user_data_dir="ny_chrome_profile",
-        headless=False,
+        user_data_dir=BROWSER_PROFILE_DIR,
+        headless=BROWSER_HEADLESS,
         viewport=None,
-        args=[
-            "--start-maximized",
-            "--disable-blink-features=AutomationControlled",
-            "--disable-infobars"
-        ]
+        args=BROWSER_ARGS
     )
 
     page = context.pages[0] if context.pages else await context.new_page()
     return playwright, context, page
 
 
+class BrowserPool:
+    """
+    Long-lived Chromium runtime shared by every docket of a run.
+
+    Playwright and the persistent context are started once; scrapers borrow
+    pages with acquire() and hand them back with release(). Pages are health
+    checked before reuse and recycled after max_page_uses dockets. If the
+    browser itself dies, the context is relaunched on the next acquire().
+    With block_resources, every page gets its own ResourceFilter.
+    """
+
+    def __init__(self, user_data_dir: str = BROWSER_PROFILE_DIR, max_pages: int = BROWSER_POOL_SIZE,
+                 max_page_uses: int = BROWSER_PAGE_MAX_USES, headless: bool = BROWSER_HEADLESS,
+                 block_resources: bool = RESOURCE_BLOCKING):
+        self.user_data_dir = user_data_dir
+        self.max_pages = max(1, max_pages)
+        self.max_page_uses = max_page_uses
+        self.headless = headless
+        self.block_resources = block_resources
+
+        self.playwright = None
+        self.context = None
+        self._context_closed = True
+        self._idle_pages = []
+        self._page_uses = {}
+        self._borrowed = set()
+        self._filters = {}
+        self._slots = asyncio.Semaphore(self.max_pages)
+        self._lock = asyncio.Lock()
+        self.launch_count = 0
+        # CookieStore version last pushed into the context
+        self.cookie_version = None
+
+    async def start(self):
+        """Start Playwright and launch the persistent context."""
+        async with self._lock:
+            await self._ensure_context()
+
+    async def _ensure_context(self):
+        if self.context is not None and not self._context_closed:
+            return
+
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        log.info(f"🌐 Launching pooled browser (profile={self.user_data_dir}, pages={self.max_pages})")
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=self.user_data_dir,
+            headless=self.headless,
+            viewport=None,
+            args=BROWSER_ARGS
+        )
+        self._context_closed = False
+        self.cookie_version = None
+        self.context.on("close", self._on_context_close)
+        self.launch_count += 1
+
+        self._idle_pages = []
+        self._page_uses = {}
+        self._filters = {}
+        for page in self.context.pages:
+            await self._register(page)
+            self._idle_pages.append(page)
+
+    async def _register(self, page):
+        self._page_uses[page] = 0
+        if self.block_resources:
+            resource_filter = ResourceFilter()
+            await resource_filter.attach(page)
+            self._filters[page] = resource_filter
+
+    def _on_context_close(self, *_):
+        self._context_closed = True
+
+    async def _is_healthy(self, page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, page):
+        self._page_uses.pop(page, None)
+        self._filters.pop(page, None)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass
+
+    async def acquire(self):
+        """Borrow a healthy page, opening a new one if none is idle."""
+        await self._slots.acquire()
+        candidate = None
+        page = None
+        try:
+            async with self._lock:
+                await self._ensure_context()
+
+                while self._idle_pages:
+                    candidate = self._idle_pages.pop()
+                    if await self._is_healthy(candidate):
+                        page, candidate = candidate, None
+                        break
+                    log.warning("♻ Discarding unhealthy pooled page.")
+                    await self._discard(candidate)
+                    candidate = None
+
+                if page is None:
+                    page = await self.context.new_page()
+                    await self._register(page)
+
+                if page in self._filters:
+                    self._filters[page].reset()
+                self._borrowed.add(page)
+                return page
+        except BaseException:
+            # Also on cancellation (a look-ahead scrape dropped at job end): hand the
+            # slot back, and put a page popped or opened along the way back in the pool
+            for idle in (candidate, page):
+                if idle is not None and idle in self._page_uses and idle not in self._idle_pages:
+                    self._idle_pages.append(idle)
+            self._slots.release()
+            raise
+
+    async def release(self, page, healthy: bool = True):
+        """Return a page to the pool, recycling it if worn out or unhealthy."""
+        if page not in self._borrowed:
+            return
+        self._borrowed.discard(page)
+        try:
+            async with self._lock:
+                if self._context_closed or page not in self._page_uses:
+                    return
+
+                self._page_uses[page] += 1
+                if not healthy or self._page_uses[page] >= self.max_page_uses:
+                    await self._discard(page)
+                    return
+
+                self._idle_pages.append(page)
+        finally:
+            self._slots.release()
+
+    def take_resource_stats(self, page):
+        """Interception counters for the docket currently loaded on page, or None."""
+        resource_filter = self._filters.get(page)
+        return resource_filter.take_stats() if resource_filter else None
+
+    async def close(self):
+        """Shut the context and Playwright down at the end of the run."""
+        async with self._lock:
+            if self.context is not None and not self._context_closed:
+                try:
+                    await self.context.close()
+                except Exception as e:
+                    log.error(f"Failed closing pooled browser: {e}")
+            self.context = None
+            self._context_closed = True
+            self._idle_pages = []
+            self._page_uses = {}
+            self._borrowed = set()
+            self._filters = {}
 
-    
\ No newline at end of file
+            if self.playwright is not None:
+                await self.playwright.stop()
+                self.playwright = None
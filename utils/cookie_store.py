@@ -0,0 +1,100 @@
+import os
+import json
+import asyncio
+import tempfile
+
+from config import COOKIE_FLUSH_INTERVAL
+from utils.logger import log
+
+COOKIE_FILE = "wcca_cookies.json"
+
+
+def _cookie_key(cookie: dict) -> tuple:
+    return (cookie.get("domain"), cookie.get("path"), cookie.get("name"))
+
+
+class CookieStore:
+    """
+    Session cookies held in memory for the whole run.
+
+    Scrapers read and update the in-memory copy; the file is only rewritten
+    when the cookies actually changed, and then at most every flush_interval
+    seconds, plus once more at shutdown. Writes go to a temp file that is
+    renamed over the original, so readers and other workers never see a
+    half-written file.
+    """
+
+    def __init__(self, path: str = COOKIE_FILE, flush_interval: float = COOKIE_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.cookies = []
+        self.version = 0
+        self._dirty = False
+        self._flush_task = None
+        self.load()
+
+    def load(self):
+        """Read the cookie file once at startup."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.cookies = json.load(f)
+            self.version += 1
+            log.info(f"🍪 Loaded {len(self.cookies)} cookies from session file.")
+        except Exception as e:
+            log.error(f"Failed loading cookies: {e}")
+
+    def get(self) -> list:
+        return self.cookies
+
+    def update(self, cookies: list) -> bool:
+        """Replace the in-memory cookies. Returns True if anything changed."""
+        current = {_cookie_key(c): c for c in self.cookies}
+        incoming = {_cookie_key(c): c for c in cookies}
+        if current == incoming:
+            return False
+        self.cookies = list(cookies)
+        self.version += 1
+        self._dirty = True
+        return True
+
+    def flush(self):
+        """Atomically write the cookies to disk if they changed since the last flush."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".cookies-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.cookies, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            log.info("💾 Session cookies saved for future use.")
+        except Exception as e:
+            log.error(f"Failed saving cookies: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def start(self):
+        """Start the background flush timer."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self):
+        """Stop the timer and write any pending changes."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self.flush()
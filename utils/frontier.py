@@ -0,0 +1,110 @@
+from config import FRONTIER_MAX_STEP, FRONTIER_CONFIRM_PROBES, FRONTIER_TAIL_SKIP
+from utils.logger import log
+
+
+class FrontierProbeError(Exception):
+    """A probe could not tell whether a docket exists (captcha, network error)."""
+
+
+def confirm_offsets(confirm_probes: int, confirm_span: int) -> list:
+    """
+    Offsets checked after a missing docket before the miss counts: the next
+    confirm_probes dockets, then doubling strides out to confirm_span
+    (e.g. 1, 2, 4, 8, 16, 32, 50 for 2 and 50).
+    """
+    offsets = list(range(1, confirm_probes + 1))
+    stride = max(confirm_probes, 1) * 2
+    while stride < confirm_span:
+        offsets.append(stride)
+        stride *= 2
+    if confirm_span > confirm_probes:
+        offsets.append(confirm_span)
+    return offsets
+
+
+def sweep_offsets(confirm_probes: int, confirm_span: int, tail_skip: int) -> list:
+    """
+    Offsets checked after the final candidate: the next confirm_probes
+    dockets, then every (tail_skip + 1)th out to confirm_span, so a run of
+    more than tail_skip dockets behind a gap is not missed.
+    """
+    stride = tail_skip + 1
+    offsets = list(range(1, confirm_probes + 1))
+    offsets.extend(n for n in range(stride, confirm_span + 1, stride) if n > confirm_probes)
+    if confirm_span > max(offsets, default=0):
+        offsets.append(confirm_span)
+    return offsets
+
+
+async def find_docket_frontier(probe, start: int, confirm_span: int = FRONTIER_CONFIRM_PROBES,
+                               tail_skip: int = FRONTIER_TAIL_SKIP, max_step: int = FRONTIER_MAX_STEP,
+                               confirm_probes: int = FRONTIER_CONFIRM_PROBES) -> int:
+    """
+    Find the highest existing docket number after start without probing linearly.
+
+    probe(n) is an async callable returning True if docket n exists and False
+    if it is unavailable; it raises FrontierProbeError when it cannot tell.
+    start is the last docket already known to be processed, confirm_span
+    the widest gap in the numbering to look across (the job's consecutive
+    skip count) and tail_skip the misses the linear pass still allows past
+    the frontier.
+
+    Gallops forward (start+1, +2, +4, ... capped at max_step) until a docket
+    is missing, then bisects between the last hit and that miss. Numbering
+    has gaps, so a miss only counts once the dockets at confirm_offsets()
+    are missing too; if one of them exists, the search continues from there.
+    Those probes thin out with distance, so the final candidate is swept
+    once more at sweep_offsets() and the search resumes from any docket
+    found behind it.
+
+    Returns the frontier docket number (start if nothing newer exists).
+    """
+    probed = {}
+
+    async def first_existing(n: int, offsets: list):
+        """Return the first existing docket among n and n + offsets, or None."""
+        for candidate in [n] + [n + offset for offset in offsets]:
+            if candidate not in probed:
+                probed[candidate] = await probe(candidate)
+            if probed[candidate]:
+                return candidate
+        return None
+
+    search = confirm_offsets(confirm_probes, confirm_span)
+    sweep = sweep_offsets(confirm_probes, confirm_span, tail_skip)
+    lo = start
+
+    while True:
+        # Gallop forward until a confirmed miss
+        step = 1
+        hi = None
+        while hi is None:
+            found = await first_existing(lo + step, search)
+            if found is None:
+                hi = lo + step
+            else:
+                lo = found
+                step = min(step * 2, max_step)
+
+        # Bisect the gap between the last hit and the miss. The probes from mid reach
+        # further than the ones that confirmed hi, so a hit past hi starts a new gallop.
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            found = await first_existing(mid, search)
+            if found is None:
+                hi = mid
+            elif found < hi:
+                lo = found
+            else:
+                lo, hi = found, None
+                break
+        if hi is None:
+            continue
+
+        found = await first_existing(lo + 1, sweep)
+        if found is None:
+            break
+        lo = found
+
+    log.info(f"🧭 Frontier found at docket {lo} after {len(probed)} probes (start {start})")
+    return lo
@@ -0,0 +1,74 @@
+from utils.logger import log
+
+PAYLOAD_OVERHEAD_BYTES = 512  # rough size of an insert payload without its HTML / case data
+
+
+def estimated_size(payload: dict) -> int:
+    """Approximate request bytes of an insert payload, without serializing it."""
+    size = PAYLOAD_OVERHEAD_BYTES + len(payload.get("htmlContent") or "")
+    if payload.get("caseData"):
+        size += len(str(payload["caseData"]))
+    return size
+
+
+def _item_results(response, count: int) -> list:
+    """
+    Per-item success flags for a batch response. A list (or {"results": [...]})
+    with one entry per item marks entries with success False or an error as
+    failed; any other 2xx response means the whole batch went in.
+    """
+    items = response.get("results") if isinstance(response, dict) else response
+    if isinstance(items, list) and len(items) == count:
+        return [
+            not (isinstance(item, dict) and (item.get("success") is False or item.get("error")))
+            for item in items
+        ]
+    return [True] * count
+
+
+def _batch_rejected(error) -> bool:
+    """
+    True if the API answered the batch call with a 4xx, i.e. refused the
+    batch itself (e.g. 400, 413, 415) without storing any of it. Timeouts,
+    transport errors and 5xx may come after the batch went in. So may 408
+    and 429, which only say "not now".
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)  # requests
+    if status is None:
+        status = getattr(error, "status", None)  # aiohttp
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
+
+
+async def send_insert_batch(api_client, path: str, batch: list) -> list:
+    """
+    Post a batch of (seq_no, payload) to the INSERT endpoint and return
+    (seq_no, ok, detail) for every docket, in batch order.
+
+    A batch of one is posted as a plain object (the original per-docket
+    call); larger batches are posted as an array. If the API rejects a
+    batch call (4xx), its dockets are sent one by one so every docket gets
+    its own verdict. Any other failure marks the whole batch failed without
+    re-posting it item by item, since the server may already have stored
+    it; the caller retries the batch, and the outbox keeps it until then.
+    """
+    if len(batch) > 1:
+        try:
+            response = await api_client.post(path, [payload for _, payload in batch])
+        except Exception as e:
+            if not _batch_rejected(e):
+                log.warning(f"⚠ Batch INSERT of {len(batch)} dockets failed ({e}) - the batch is retried as a whole")
+                return [(seq_no, False, e) for seq_no, _ in batch]
+            log.warning(f"⚠ Batch INSERT of {len(batch)} dockets rejected ({e}) - sending them one by one")
+        else:
+            log.info(f"📤 INSERT batch of {len(batch)} dockets ({batch[0][0]}-{batch[-1][0]}): {response}")
+            return [(seq_no, ok, response) for (seq_no, _), ok in zip(batch, _item_results(response, len(batch)))]
+
+    results = []
+    for seq_no, payload in batch:
+        try:
+            response = await api_client.post(path, payload)
+        except Exception as e:
+            results.append((seq_no, False, e))
+            continue
+        results.append((seq_no, True, response))
+    return results
@@ -0,0 +1,59 @@
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from utils.logger import log
+
+# Milliseconds between checks (Playwright polls on an interval or "raf", not on DOM mutations)
+PAGE_STATE_POLL_MS = 100
+
+# Page states, checked in this order on every poll
+STATE_SUMMARY = "summary"
+STATE_UNAVAILABLE = "unavailable"
+STATE_CAPTCHA = "captcha"
+STATE_ERROR = "error"
+STATE_TIMEOUT = "timeout"
+
+PAGE_STATE_MARKERS = [
+    (STATE_SUMMARY, ["Case Summary"]),
+    (STATE_UNAVAILABLE, ["Your request could not be processed."]),
+    (STATE_CAPTCHA, ["Please complete the CAPTCHA"]),
+    (STATE_ERROR, ["502 Bad Gateway", "503 Service", "504 Gateway", "Service Unavailable", "An unexpected error has occurred"]),
+]
+
+PAGE_STATE_SCRIPT = """
+([markers, excluded]) => {
+    const text = (document.body && document.body.innerText) || "";
+    for (const [state, snippets] of markers) {
+        if (excluded.includes(state)) continue;
+        if (snippets.some(s => text.includes(s))) return state;
+    }
+    return null;
+}
+"""
+
+
+async def wait_for_page_state(page, timeout: int = 15000, exclude=()) -> str:
+    """
+    Resolve as soon as the page shows Case Summary, the unavailable notice,
+    the captcha prompt or a server error page, whichever comes first.
+
+    The check reruns every PAGE_STATE_POLL_MS instead of sleeping for a
+    fixed time. States listed in exclude are ignored, e.g. exclude=("captcha",)
+    waits for the page to move past a captcha. Returns one of the STATE_*
+    values, or STATE_TIMEOUT if none appeared within timeout ms or the wait
+    itself failed (e.g. the page navigated away mid-check), so the caller
+    classifies the page from its HTML instead of treating it as a network
+    failure.
+    """
+    try:
+        handle = await page.wait_for_function(
+            PAGE_STATE_SCRIPT,
+            arg=[PAGE_STATE_MARKERS, list(exclude)],
+            polling=PAGE_STATE_POLL_MS,
+            timeout=timeout
+        )
+        return await handle.json_value()
+    except PlaywrightTimeoutError:
+        return STATE_TIMEOUT
+    except PlaywrightError as e:
+        log.warning(f"⚠ Page state check failed: {e}")
+        return STATE_TIMEOUT
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import tempfile
+
+from config import (
+    RATE_CONTROL, RATE_MIN, RATE_MAX, RATE_INCREASE, RATE_DECREASE,
+    RATE_LATENCY_SPIKE, RATE_BACKOFF_COOLDOWN, RATE_STATUS_FILE
+)
+from utils.logger import log
+
+LATENCY_SMOOTHING = 0.2   # weight of the newest sample in the latency average
+STATUS_WRITE_INTERVAL = 5  # seconds between status file rewrites
+INCREASE_LOG_EVERY = 25    # clean responses between "rate raised" log lines
+
+
+class AimdRateController:
+    """
+    Adapts a TokenBucket's rate to what WCCA tolerates (additive increase,
+    multiplicative decrease).
+
+    Every clean, normally fast response raises the rate by increase requests
+    per second, up to max_rate. A captcha page, a timeout or network failure,
+    or a response slower than latency_spike times the running average
+    multiplies the rate by decrease, down to min_rate. Back-offs are at most
+    one per cooldown seconds, so a burst of concurrent failures caused by
+    the same overload only counts once.
+
+    snapshot() returns the current rate and the last decision; the same data
+    is written to status_file for monitoring.
+    """
+
+    def __init__(self, bucket, enabled: bool = RATE_CONTROL, min_rate: float = RATE_MIN, max_rate: float = RATE_MAX,
+                 increase: float = RATE_INCREASE, decrease: float = RATE_DECREASE,
+                 latency_spike: float = RATE_LATENCY_SPIKE, cooldown: float = RATE_BACKOFF_COOLDOWN,
+                 status_file: str = RATE_STATUS_FILE):
+        self.bucket = bucket
+        # A disabled bucket (rate 0) means unlimited requests; nothing to adapt
+        self.enabled = enabled and bucket.rate > 0
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_spike = latency_spike
+        self.cooldown = cooldown
+        self.status_file = status_file
+
+        self.avg_latency = None
+        self.last_backoff = 0.0
+        self.last_decision = None
+        self.increases = 0
+        self.decreases = 0
+        self._status_written = 0.0
+
+        if self.enabled:
+            self.bucket.set_rate(min(max(bucket.rate, min_rate), max_rate))
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _signal(self, results):
+        """Return the reason to back off for this result, or None if it was clean."""
+        if results is None:
+            return "network error"
+        if results.get("captcha_seen") or results.get("status") == "failed":
+            return "captcha"
+        if results.get("timed_out"):
+            return "timeout"
+        latency = results.get("latency")
+        if latency is not None and self.avg_latency is not None and latency > self.avg_latency * self.latency_spike:
+            return f"latency spike ({latency:.1f}s vs avg {self.avg_latency:.1f}s)"
+        return None
+
+    def record(self, results):
+        """Feed the outcome of one case page request into the controller."""
+        if not self.enabled:
+            return
+
+        reason = self._signal(results)
+        latency = results.get("latency") if results else None
+        if latency is not None and not reason:
+            # Spikes are kept out of the average so one slow page doesn't raise the bar
+            if self.avg_latency is None:
+                self.avg_latency = latency
+            else:
+                self.avg_latency += LATENCY_SMOOTHING * (latency - self.avg_latency)
+
+        now = time.time()
+        if reason:
+            if now - self.last_backoff < self.cooldown:
+                return
+            old_rate = self.rate
+            self.bucket.set_rate(max(self.min_rate, old_rate * self.decrease))
+            self.last_backoff = now
+            self.decreases += 1
+            self.last_decision = {"action": "decrease", "reason": reason, "rate": round(self.rate, 3), "at": now}
+            log.warning(f"🐢 Rate lowered {old_rate:.2f} -> {self.rate:.2f} req/s ({reason})")
+        else:
+            self.bucket.set_rate(min(self.max_rate, self.rate + self.increase))
+            self.increases += 1
+            self.last_decision = {"action": "increase", "reason": "clean response", "rate": round(self.rate, 3), "at": now}
+            if self.increases % INCREASE_LOG_EVERY == 0:
+                log.info(f"🐇 Rate raised to {self.rate:.2f} req/s after {INCREASE_LOG_EVERY} clean responses")
+
+        if now - self._status_written >= STATUS_WRITE_INTERVAL:
+            self.write_status()
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "rate": round(self.rate, 3),
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate,
+            "avg_latency": round(self.avg_latency, 3) if self.avg_latency is not None else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "last_decision": self.last_decision
+        }
+
+    def write_status(self):
+        """Atomically rewrite the status file with the current snapshot."""
+        self._status_written = time.time()
+        if not self.status_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self.status_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=".rate-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.status_file)
+        except Exception as e:
+            log.error(f"Failed writing rate status: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,63 @@
+import time
+import asyncio
+from urllib.parse import urlsplit
+
+from config import HOST_RATE_LIMIT, HOST_RATE_BURST
+
+
+class TokenBucket:
+    """
+    Allows rate requests per second on average, with bursts of up to burst
+    requests. Callers wait in arrival order. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate: float):
+        """Change the refill rate; tokens earned so far are kept."""
+        self._refill()
+        self.rate = rate
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, shared by every job and session of the worker,
+    so the total request rate against a site stays within the limit however
+    many jobs run at once.
+    """
+
+    def __init__(self, rate: float = HOST_RATE_LIMIT, burst: int = HOST_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def wait(self, url: str):
+        """Wait for a request slot on the url's host."""
+        await self.bucket(urlsplit(url).hostname or "").acquire()
@@ -0,0 +1,85 @@
+import re
+
+from config import RESOURCE_ALLOWED_TYPES, RESOURCE_ALLOWED_URL_PATTERNS, RESOURCE_CAPTCHA_URL_PATTERNS
+
+# Rough transfer sizes used to estimate what a blocked request would have cost.
+# Aborted requests never report a size, so these are averages seen on WCCA pages.
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 25_000,
+    "font": 40_000,
+    "stylesheet": 20_000,
+    "media": 200_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+class ResourceFilter:
+    """
+    Request interception for case detail pages.
+
+    A request is allowed when its URL matches a captcha provider (the puzzle
+    needs its images and scripts), or when its resource type is in the
+    allowlist and its URL matches one of the allowed patterns. Everything else
+    (images, fonts, stylesheets, analytics) is aborted before it downloads.
+    """
+
+    def __init__(self, allowed_types=RESOURCE_ALLOWED_TYPES, allowed_url_patterns=RESOURCE_ALLOWED_URL_PATTERNS,
+                 captcha_url_patterns=RESOURCE_CAPTCHA_URL_PATTERNS):
+        self.allowed_types = set(allowed_types)
+        self.allowed_url_patterns = [re.compile(p, re.I) for p in allowed_url_patterns]
+        self.captcha_url_patterns = [re.compile(p, re.I) for p in captcha_url_patterns]
+        self.reset()
+
+    def reset(self):
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = {}
+        self.bytes_loaded = 0
+        self.estimated_bytes_saved = 0
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        if any(p.search(url) for p in self.captcha_url_patterns):
+            return True
+        if resource_type not in self.allowed_types:
+            return False
+        # The main document is always allowed so error and captcha pages still render
+        if resource_type == "document":
+            return True
+        return any(p.search(url) for p in self.allowed_url_patterns)
+
+    async def handle_route(self, route, request):
+        if self.allows(request.url, request.resource_type):
+            self.allowed_requests += 1
+            await route.continue_()
+            return
+
+        resource_type = request.resource_type
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        await route.abort("blockedbyclient")
+
+    def on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.bytes_loaded += int(length)
+
+    async def attach(self, page):
+        """Install the filter on a page."""
+        await page.route("**/*", self.handle_route)
+        page.on("response", self.on_response)
+
+    def take_stats(self) -> dict:
+        """Return the counters gathered since the last call and start a fresh window."""
+        stats = {
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "bytes_loaded": self.bytes_loaded,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
+        self.reset()
+        return stats
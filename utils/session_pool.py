@@ -0,0 +1,136 @@
+import time
+
+from config import (
+    BROWSER_PROFILE_DIR, BROWSER_SESSIONS, SESSION_CAPTCHA_BUDGET,
+    SESSION_BUDGET_MARGIN, SESSION_CAPTCHA_COOLDOWN, FETCH_ENGINE
+)
+from scrapers.wcca_http_fetcher import WccaHttpFetcher
+from utils.browser_manager import BrowserPool
+from utils.cookie_store import CookieStore, COOKIE_FILE
+from utils.logger import log
+
+
+def session_cookie_file(index: int) -> str:
+    """Cookie file for a session; session 0 keeps the original wcca_cookies.json."""
+    if index == 0:
+        return COOKIE_FILE
+    root, ext = COOKIE_FILE.rsplit(".", 1)
+    return f"{root}_{index}.{ext}"
+
+
+def session_profile_dir(index: int) -> str:
+    """Chrome profile for a session; session 0 keeps the original profile directory."""
+    return BROWSER_PROFILE_DIR if index == 0 else f"{BROWSER_PROFILE_DIR}_{index}"
+
+
+class BrowserSession:
+    """
+    One independent WCCA identity: its own Chrome profile, cookie jar and
+    (optionally) HTTP fetcher, plus a count of requests made since its last
+    captcha.
+    """
+
+    def __init__(self, index: int, max_pages: int):
+        self.index = index
+        self.name = f"session-{index}"
+        self.cookie_store = CookieStore(path=session_cookie_file(index))
+        self.browser_pool = BrowserPool(user_data_dir=session_profile_dir(index), max_pages=max_pages)
+        self.http_fetcher = WccaHttpFetcher(self.cookie_store) if FETCH_ENGINE == "http" else None
+
+        self.requests_since_captcha = 0
+        self.captchas = 0
+        self.blocked_until = 0.0
+        self.in_flight = 0
+
+    def is_blocked(self, now: float) -> bool:
+        return now < self.blocked_until
+
+    async def start(self):
+        self.cookie_store.start()
+        await self.browser_pool.start()
+        if self.http_fetcher is not None:
+            await self.http_fetcher.start()
+
+    async def close(self):
+        if self.http_fetcher is not None:
+            log.info(f"⚡ HTTP fetch stats ({self.name}): {self.http_fetcher.stats}")
+            await self.http_fetcher.close()
+        await self.browser_pool.close()
+        await self.cookie_store.close()
+
+
+class SessionPool:
+    """
+    Schedules dockets across several BrowserSessions.
+
+    Each session tracks how many requests it made since its last captcha.
+    pick() prefers the least busy session that is still budget_margin
+    requests short of its captcha budget, and falls back to whichever
+    unblocked session has the most budget left. A session whose captcha
+    could not be solved is blocked for cooldown seconds while the others
+    carry on. pick() only returns None when every session is blocked.
+    """
+
+    def __init__(self, size: int = BROWSER_SESSIONS, max_pages: int = 1, captcha_budget: int = SESSION_CAPTCHA_BUDGET,
+                 budget_margin: int = SESSION_BUDGET_MARGIN, cooldown: float = SESSION_CAPTCHA_COOLDOWN):
+        self.sessions = [BrowserSession(i, max_pages) for i in range(max(1, size))]
+        self.captcha_budget = captcha_budget
+        self.budget_margin = budget_margin
+        self.cooldown = cooldown
+
+    async def start(self):
+        for session in self.sessions:
+            await session.start()
+
+    async def close(self):
+        for session in self.sessions:
+            await session.close()
+
+    def remaining_budget(self, session: BrowserSession) -> int:
+        return self.captcha_budget - session.requests_since_captcha
+
+    def pick(self):
+        """Choose the session for the next docket, or None if all are blocked."""
+        now = time.time()
+        open_sessions = [s for s in self.sessions if not s.is_blocked(now)]
+        if not open_sessions:
+            return None
+
+        fresh = [s for s in open_sessions if self.remaining_budget(s) > self.budget_margin]
+        if fresh:
+            session = min(fresh, key=lambda s: (s.in_flight, -self.remaining_budget(s)))
+        else:
+            session = max(open_sessions, key=self.remaining_budget)
+
+        session.in_flight += 1
+        return session
+
+    def record(self, session: BrowserSession, results):
+        """Account for a finished docket on the session that served it."""
+        session.in_flight -= 1
+        if results is None:
+            return
+
+        session.requests_since_captcha += 1
+        if results.get("captcha_seen"):
+            session.captchas += 1
+            session.requests_since_captcha = 0
+
+        if results.get("status") == "failed":
+            session.blocked_until = time.time() + self.cooldown
+            log.warning(
+                f"🚧 {session.name} hit an unsolved CAPTCHA - resting it for {self.cooldown:.0f}s "
+                f"({len(self.available_sessions())} session(s) still available)"
+            )
+
+    def available_sessions(self):
+        now = time.time()
+        return [s for s in self.sessions if not s.is_blocked(now)]
+
+    def status(self) -> str:
+        now = time.time()
+        parts = []
+        for s in self.sessions:
+            state = "blocked" if s.is_blocked(now) else "open"
+            parts.append(f"{s.name}: {state}, {s.requests_since_captcha}/{self.captcha_budget} since captcha")
+        return "; ".join(parts)
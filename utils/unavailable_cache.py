@@ -0,0 +1,104 @@
+import time
+import sqlite3
+
+from config import UNAVAILABLE_CACHE_FILE, UNAVAILABLE_CACHE_TTL, UNAVAILABLE_CACHE_MAX_ENTRIES
+from utils.logger import log
+
+PRUNE_EVERY = 500  # marks between size/TTL pruning passes
+
+
+class UnavailableDocketCache:
+    """
+    Local SQLite index of dockets recently confirmed as unavailable, keyed by
+    (countyNo, docketYear, docketType, seqNo).
+
+    Entries expire after ttl seconds so new filings are picked up again, and
+    the table is trimmed to max_entries (oldest first). A ttl of 0 disables
+    the cache.
+    """
+
+    def __init__(self, path: str = UNAVAILABLE_CACHE_FILE, ttl: float = UNAVAILABLE_CACHE_TTL,
+                 max_entries: int = UNAVAILABLE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = ttl > 0
+        self.hits = 0
+        self._marks_since_prune = 0
+        self.conn = None
+
+        if not self.enabled:
+            return
+
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS unavailable_dockets (
+                county_no INTEGER NOT NULL,
+                docket_year INTEGER NOT NULL,
+                docket_type TEXT NOT NULL,
+                seq_no INTEGER NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (county_no, docket_year, docket_type, seq_no)
+            ) WITHOUT ROWID
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_unavailable_checked_at ON unavailable_dockets (checked_at)")
+        self.prune()
+
+    def is_unavailable(self, county_no, docket_year, docket_type, seq_no) -> bool:
+        """True if the docket was confirmed unavailable within the TTL."""
+        if not self.enabled:
+            return False
+        row = self.conn.execute(
+            "SELECT checked_at FROM unavailable_dockets WHERE county_no=? AND docket_year=? AND docket_type=? AND seq_no=?",
+            (int(county_no), int(docket_year), docket_type, int(seq_no))
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return False
+        self.hits += 1
+        return True
+
+    def mark_unavailable(self, county_no, docket_year, docket_type, seq_no):
+        if not self.enabled:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO unavailable_dockets VALUES (?, ?, ?, ?, ?)",
+            (int(county_no), int(docket_year), docket_type, int(seq_no), time.time())
+        )
+        self._marks_since_prune += 1
+        if self._marks_since_prune >= PRUNE_EVERY:
+            self.prune()
+
+    def forget(self, county_no, docket_year, docket_type, seq_no):
+        """Drop a docket that turned out to exist."""
+        if not self.enabled:
+            return
+        self.conn.execute(
+            "DELETE FROM unavailable_dockets WHERE county_no=? AND docket_year=? AND docket_type=? AND seq_no=?",
+            (int(county_no), int(docket_year), docket_type, int(seq_no))
+        )
+
+    def prune(self):
+        """Remove expired entries and trim the table to max_entries."""
+        self._marks_since_prune = 0
+        self.conn.execute("DELETE FROM unavailable_dockets WHERE checked_at < ?", (time.time() - self.ttl,))
+        count = self.conn.execute("SELECT COUNT(*) FROM unavailable_dockets").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                """
+                DELETE FROM unavailable_dockets WHERE (county_no, docket_year, docket_type, seq_no) IN (
+                    SELECT county_no, docket_year, docket_type, seq_no FROM unavailable_dockets
+                    ORDER BY checked_at LIMIT ?
+                )
+                """,
+                (excess,)
+            )
+            log.info(f"🗑 Trimmed {excess} old entries from the unavailable-docket cache")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,200 @@
+import json
+import time
+import zlib
+import sqlite3
+
+from config import OUTBOX_FILE, OUTBOX_MAX_BYTES, OUTBOX_SYNC
+from utils.insert_batcher import send_insert_batch
+from utils.logger import log
+
+CHECKPOINT_EVERY = 200  # acks between WAL checkpoints / freed-page reclaims
+UPLOADED_KEEP_SECONDS = 7 * 24 * 3600  # how long confirmed dockets are remembered for re-leased jobs
+
+
+def docket_key(payload: dict) -> tuple:
+    """(agencyID, year, docketType) of an insert payload: the job it belongs to."""
+    return int(payload["agencyID"]), int(payload["year"]), payload["docketType"]
+
+
+class UploadOutbox:
+    """
+    Crash-safe local copy of every scraped docket until the API confirmed it.
+
+    append() stores the payload (zlib-compressed JSON) before it is queued
+    for upload and returns its id; ack() deletes it once the INSERT
+    succeeded. Whatever is still in the outbox after a crash or an API
+    outage is sent again by replay() on the next start, instead of being
+    scraped again.
+
+    Every confirmed docket is also remembered for a while, keyed by its
+    county, year and case type: a job leased again from an older docket
+    number (after a crash, or re-queued from its confirmed prefix) skips
+    what uploaded_since() reports and uploads what pending_for() still
+    holds, instead of scraping and inserting those dockets twice.
+
+    sync sets PRAGMA synchronous ("off", "normal" or "full"): "full" fsyncs
+    every write, "normal" only at WAL checkpoints, which can lose the last
+    few dockets on power loss but not on a process crash. Once max_bytes of
+    payload are pending, new dockets are uploaded without an outbox copy
+    until acks free space again. A path of "" disables the outbox.
+    """
+
+    def __init__(self, path: str = OUTBOX_FILE, max_bytes: int = OUTBOX_MAX_BYTES, sync: str = OUTBOX_SYNC):
+        self.enabled = bool(path)
+        self.max_bytes = max_bytes
+        self.pending_bytes = 0
+        self.skipped = 0
+        self.replayed = 0
+        self._acks_since_checkpoint = 0
+        self._keys = {}  # outbox id -> (agencyID, year, docketType, seqNo), for ack()
+        self.conn = None
+
+        if not self.enabled:
+            return
+
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={sync.upper()}")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                seq_no INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploaded (
+                agency_id INTEGER NOT NULL,
+                year INTEGER NOT NULL,
+                docket_type TEXT NOT NULL,
+                seq_no INTEGER NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (agency_id, year, docket_type, seq_no)
+            )
+            """
+        )
+        self.conn.execute("DELETE FROM uploaded WHERE uploaded_at < ?", (time.time() - UPLOADED_KEEP_SECONDS,))
+        self.pending_bytes = self.conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM outbox").fetchone()[0]
+
+    def pending(self) -> int:
+        if not self.enabled:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def append(self, path: str, seq_no: int, payload: dict):
+        """Store a payload before upload. Returns its id, or None if it was not stored."""
+        if not self.enabled:
+            return None
+        blob = zlib.compress(json.dumps(payload).encode("utf-8"), 1)
+        if self.pending_bytes + len(blob) > self.max_bytes:
+            if self.skipped == 0:
+                log.warning(f"⚠ Upload outbox full ({self.pending_bytes // (1024 * 1024)} MB pending) - new dockets are not persisted until it drains")
+            self.skipped += 1
+            return None
+        cursor = self.conn.execute(
+            "INSERT INTO outbox (path, seq_no, payload, created_at) VALUES (?, ?, ?, ?)",
+            (path, int(seq_no), blob, time.time())
+        )
+        self.pending_bytes += len(blob)
+        self._keys[cursor.lastrowid] = docket_key(payload) + (int(seq_no),)
+        return cursor.lastrowid
+
+    def ack(self, outbox_id):
+        """Drop a payload the API confirmed, remembering its docket as uploaded."""
+        if not self.enabled or outbox_id is None:
+            return
+        row = self.conn.execute("SELECT LENGTH(payload) FROM outbox WHERE id=?", (outbox_id,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute("DELETE FROM outbox WHERE id=?", (outbox_id,))
+        self.pending_bytes -= row[0]
+        key = self._keys.pop(outbox_id, None)
+        if key is not None:
+            self.conn.execute("INSERT OR REPLACE INTO uploaded VALUES (?, ?, ?, ?, ?)", key + (time.time(),))
+        self._acks_since_checkpoint += 1
+        if self._acks_since_checkpoint >= CHECKPOINT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Fold the WAL back into the database and hand freed pages back to the filesystem."""
+        self._acks_since_checkpoint = 0
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("PRAGMA incremental_vacuum")
+
+    def unacked(self):
+        """Yield (id, path, seq_no, payload) for every pending upload, oldest first."""
+        if not self.enabled:
+            return
+        rows = self.conn.execute("SELECT id, path, seq_no, payload FROM outbox ORDER BY id").fetchall()
+        for outbox_id, path, seq_no, blob in rows:
+            payload = json.loads(zlib.decompress(blob))
+            self._keys.setdefault(outbox_id, docket_key(payload) + (seq_no,))
+            yield outbox_id, path, seq_no, payload
+
+    def uploaded_since(self, agency_id, year, docket_type, after: int) -> set:
+        """Docket numbers above after that the API already confirmed for this county/year/type."""
+        if not self.enabled:
+            return set()
+        rows = self.conn.execute(
+            "SELECT seq_no FROM uploaded WHERE agency_id=? AND year=? AND docket_type=? AND seq_no>?",
+            (int(agency_id), int(year), docket_type, int(after))
+        ).fetchall()
+        return {seq_no for seq_no, in rows}
+
+    def pending_for(self, agency_id, year, docket_type, after: int) -> dict:
+        """seq_no -> (id, payload) of this county/year/type's dockets above after still awaiting upload."""
+        key = (int(agency_id), int(year), docket_type)
+        return {
+            seq_no: (outbox_id, payload)
+            for outbox_id, _, seq_no, payload in self.unacked()
+            if seq_no > int(after) and docket_key(payload) == key
+        }
+
+    async def replay(self, api_client, batch_size: int = 1) -> bool:
+        """
+        Send every unacknowledged payload left by an earlier run, in the
+        order it was scraped, acking what goes in. Stops at the first batch
+        with a failure and keeps the rest for the next start. Returns True
+        when the outbox is empty afterwards.
+        """
+        entries = list(self.unacked())
+        if not entries:
+            return True
+        log.info(f"📮 Replaying {len(entries)} docket(s) left in the upload outbox")
+
+        pending = []
+        for i, entry in enumerate(entries):
+            pending.append(entry)
+            last = i == len(entries) - 1
+            if len(pending) < batch_size and not last and entries[i + 1][1] == entry[1]:
+                continue
+
+            path = pending[0][1]
+            results = await send_insert_batch(api_client, path, [(seq_no, payload) for _, _, seq_no, payload in pending])
+            # Results come back in batch order, which maps them to outbox rows even across jobs
+            failed = 0
+            for (outbox_id, _, _, _), (_, ok, _) in zip(pending, results):
+                if ok:
+                    self.ack(outbox_id)
+                    self.replayed += 1
+                else:
+                    failed += 1
+            if failed:
+                log.warning(f"⚠ Outbox replay stopped: {failed} docket(s) of {path} still failing - kept for the next start")
+                return False
+            pending = []
+
+        log.info(f"✅ Outbox replay done: {self.replayed} docket(s) uploaded")
+        return True
+
+    def close(self):
+        if self.conn is not None:
+            self.compact()
+            self.conn.close()
+            self.conn = None
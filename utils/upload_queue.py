@@ -0,0 +1,176 @@
+import time
+import asyncio
+from collections import deque
+
+from config import (
+    INSERT_BATCH_PATH, INSERT_BATCH_SIZE, INSERT_BATCH_MAX_BYTES, INSERT_BATCH_MAX_WAIT,
+    UPLOAD_QUEUE_SIZE, UPLOAD_WORKERS, UPLOAD_RETRIES, UPLOAD_RETRY_DELAY
+)
+from utils.insert_batcher import send_insert_batch, estimated_size
+from utils.logger import log
+
+CLOSE_POLL_INTERVAL = 0.25  # seconds between checks for close() while a batch is filling
+
+
+class UploadQueue:
+    """
+    Background INSERT stage for one job.
+
+    The scraping loop put()s finished dockets into a bounded queue and a
+    pool of uploader tasks drains it, in batches of up to max_items dockets
+    / max_bytes (a partial batch goes out after max_wait seconds). When the
+    uploaders fall behind, put() waits for room, which slows scraping down
+    to the upload rate. Failed dockets are retried with exponential backoff;
+    only a docket that still fails after retries marks the queue failed.
+
+    Uploads finish out of order, so the queue tracks the contiguous prefix
+    of confirmed dockets in put() order: confirmed_through is the last
+    docket up to which everything is in, and on_advance(seq_no) fires each
+    time it moves. on_result(seq_no, ok, detail) fires for every final
+    verdict.
+
+    With an outbox, every docket is written to disk before it is queued and
+    acknowledged there once its INSERT is confirmed; dockets that never get
+    through stay in the outbox and are replayed on the next start.
+    """
+
+    def __init__(self, api_client, on_result=None, on_advance=None, path: str = INSERT_BATCH_PATH,
+                 max_size: int = UPLOAD_QUEUE_SIZE, workers: int = UPLOAD_WORKERS,
+                 max_items: int = INSERT_BATCH_SIZE, max_bytes: int = INSERT_BATCH_MAX_BYTES,
+                 max_wait: float = INSERT_BATCH_MAX_WAIT, retries: int = UPLOAD_RETRIES,
+                 retry_delay: float = UPLOAD_RETRY_DELAY, outbox=None):
+        self.api_client = api_client
+        self.outbox = outbox
+        self.on_result = on_result
+        self.on_advance = on_advance
+        self.path = path
+        self.queue = asyncio.Queue(maxsize=max(1, max_size))
+        self.worker_count = max(1, workers)
+        self.max_items = max(1, max_items)
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        self.order = deque()  # seq_nos not yet part of the confirmed prefix, in put() order
+        self.verdicts = {}    # seq_no -> True/False for finished uploads outside the prefix
+        self.outbox_ids = {}  # seq_no -> outbox row kept until the upload is confirmed
+        self.confirmed_through = None
+        self.failed = False
+        self.uploaded = 0
+        self.batches_sent = 0
+        self.backpressure_seconds = 0.0
+        self.closing = False
+        self._workers = []
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def put(self, seq_no: int, payload: dict, outbox_id=None):
+        """
+        Queue a docket for upload, waiting for room while the uploaders catch
+        up. outbox_id is given for a payload that is already in the outbox.
+        """
+        if outbox_id is not None:
+            self.outbox_ids[seq_no] = outbox_id
+        elif self.outbox is not None:
+            self.outbox_ids[seq_no] = self.outbox.append(self.path, seq_no, payload)
+        self.order.append(seq_no)
+        if self.queue.full():
+            started = time.monotonic()
+            await self.queue.put((seq_no, payload))
+            self.backpressure_seconds += time.monotonic() - started
+        else:
+            self.queue.put_nowait((seq_no, payload))
+
+    def skip_uploaded(self, seq_no: int):
+        """Count a docket the API confirmed earlier as in, without uploading it again."""
+        self.order.append(seq_no)
+        self.verdicts[seq_no] = True
+        self._advance()
+
+    async def _next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        size = estimated_size(batch[0][1])
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_items and size < self.max_bytes:
+            if not self.queue.empty():
+                item = self.queue.get_nowait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.closing:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), min(remaining, CLOSE_POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    continue
+            batch.append(item)
+            size += estimated_size(item[1])
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._upload(batch)
+            except Exception as e:
+                log.error(f"❌ Uploader error: {e}")
+                for seq_no, _ in batch:
+                    self._finish(seq_no, False, e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _upload(self, batch: list):
+        for attempt in range(self.retries + 1):
+            self.batches_sent += 1
+            results = await send_insert_batch(self.api_client, self.path, batch)
+            payloads = dict(batch)
+            retry = []
+            for seq_no, ok, detail in results:
+                if ok:
+                    self._finish(seq_no, True, detail)
+                elif attempt < self.retries:
+                    retry.append((seq_no, payloads[seq_no]))
+                else:
+                    self._finish(seq_no, False, detail)
+            if not retry:
+                return
+            delay = self.retry_delay * (2 ** attempt)
+            log.warning(f"⚠ INSERT failed for {len(retry)} docket(s) - retry {attempt + 1}/{self.retries} in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            batch = retry
+
+    def _finish(self, seq_no: int, ok: bool, detail):
+        outbox_id = self.outbox_ids.pop(seq_no, None)
+        if ok:
+            self.uploaded += 1
+            if self.outbox is not None:
+                self.outbox.ack(outbox_id)
+        else:
+            self.failed = True
+        if self.on_result is not None:
+            self.on_result(seq_no, ok, detail)
+
+        self.verdicts[seq_no] = ok
+        self._advance()
+
+    def _advance(self):
+        # Advance the confirmed prefix over every docket that is now in
+        advanced = False
+        while self.order and self.verdicts.get(self.order[0]) is True:
+            self.confirmed_through = self.order.popleft()
+            del self.verdicts[self.confirmed_through]
+            advanced = True
+        if advanced and self.on_advance is not None:
+            self.on_advance(self.confirmed_through)
+
+    async def close(self):
+        """Wait until everything queued has been uploaded (or given up on), then stop the uploaders."""
+        self.closing = True
+        await self.queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []